@@ -15,17 +15,45 @@ Usage example:
     )
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Union, Any
+from typing import Optional, Dict, Iterator, List, Union, Any, Tuple
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
 
+import requests
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
+from django.db.models import Prefetch
 from sensor.models import Station, Sensor
 from sensor.get_sensor_data import GetSensorData  # Use optimized version
 
 logger = logging.getLogger(__name__)
 
+# Serializes manifest writes of all downloaders within the process
+_manifest_file_lock = threading.Lock()
+
+# Sensors downloaded at the same time per station, at most
+SENSOR_WORKERS = 4
+
+
+def pool_sizes(n_stations: int, max_total: int, max_stations: int,
+               max_sensors: int = SENSOR_WORKERS) -> Tuple[int, int, int]:
+    """
+    Threads per level (stations, sensors per station, dates per sensor),
+    sized so that all of them together stay within ``max_total`` concurrent
+    downloads instead of mostly waiting on the shared semaphore.
+    """
+    station_workers = max(1, min(max_stations, n_stations))
+    sensor_workers = max(1, min(max_sensors, max_total // station_workers))
+    date_workers = max(1, max_total // (station_workers * sensor_workers))
+    return station_workers, sensor_workers, date_workers
+
 
 class StationDataDownloader:
     """
@@ -45,10 +73,23 @@ class StationDataDownloader:
         'pms7003': 'pms7003',
     }
 
+    # Exact names hit the dict directly; anything else falls back to one regex search
+    _SENSOR_TYPE_EXACT = frozenset(SENSOR_TYPE_MAP)
+    _SENSOR_TYPE_RE = re.compile('|'.join(re.escape(key) for key in SENSOR_TYPE_MAP))
+
+    # Characters replaced by '_' in station directory names
+    _NAME_TRANS = str.maketrans({'-': '_', '(': '_', ')': '_', ',': '_', ' ': '_'})
+
     def __init__(self, station_id: Optional[int] = None,
                  station_uid: Optional[str] = None,
                  output_base_dir: str = 'sensor_data_by_station',
-                 max_workers: int = 15):  # NEW: Configurable workers
+                 max_workers: int = 15,  # NEW: Configurable workers
+                 semaphore: Optional[threading.BoundedSemaphore] = None,
+                 sensor_workers: int = SENSOR_WORKERS,
+                 use_fast_merge: bool = True,
+                 station: Optional[Station] = None,
+                 session: Optional[requests.Session] = None,
+                 merged_format: str = 'csv'):
         """
         Initialize the downloader for a specific station.
 
@@ -57,21 +98,104 @@ class StationDataDownloader:
             station_uid: UUID of the station (alternative to station_id)
             output_base_dir: Base directory for all downloads
             max_workers: Number of parallel workers for downloads (default: 15)
+            semaphore: Optional semaphore shared with other downloaders to cap
+                the total number of dates downloading at once (default: one
+                of ``max_workers`` for all sensors of this station)
+            sensor_workers: Number of sensors downloaded at the same time (default: 4)
+            use_fast_merge: If True, merge monthly files by byte concatenation
+                when their headers match instead of a pandas round-trip
+            station: Already loaded Station (skips the lookup by id/uid)
+            session: Optional HTTP session shared with other downloaders
+            merged_format: Format of the merged files, 'csv' (default) or 'parquet'
         """
-        self.station = self._get_station(station_id, station_uid)
+        self.station = station if station is not None else self._get_station(station_id, station_uid)
+        # Sensors prefetched by bulk_from_ids(), used instead of querying again
+        self._cached_sensors: Optional[List[Sensor]] = None
         self.output_base_dir = Path(output_base_dir)
         self.station_dir = self._create_station_directory()
+        self._station_dir_str = str(self.station_dir)
         self.max_workers = max_workers
+        self.sensor_workers = sensor_workers
+        # Without it, every sensor thread would run max_workers dates of its own
+        self._semaphore = semaphore if semaphore is not None else threading.BoundedSemaphore(max_workers)
+        self.use_fast_merge = use_fast_merge
+        self.merged_format = merged_format
+        self._session = session
+
+        # Months already downloaded completely, shared by all sensors of the station
+        self._manifest_path = self.station_dir / 'manifest.json'
+        self._manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+
+        # The OPTIMIZED sensor data downloader is built on first use (see downloader)
+        self._downloader: Optional[GetSensorData] = None
+        self._downloader_lock = threading.Lock()
+
+        logger.info("Initialized OPTIMIZED downloader for station: %s", self.station.name)
+        logger.info("Output directory: %s", self.station_dir)
+        logger.info("Parallel workers: %d", max_workers)
+
+    @property
+    def downloader(self) -> GetSensorData:
+        """
+        Sensor data downloader of the station, created on first access so that
+        summaries and stations without sensors never open an HTTP session.
+        Per-sensor downloads use their own GetSensorData sharing its session.
+        """
+        with self._downloader_lock:
+            if self._downloader is None:
+                self._downloader = GetSensorData(
+                    output_dir=self.station_dir,
+                    max_workers=self.max_workers,
+                    semaphore=self._semaphore,
+                    session=self._session,
+                    use_fast_merge=self.use_fast_merge,
+                    merged_format=self.merged_format,
+                    manifest=self._manifest_snapshot()
+                )
+        return self._downloader
+
+    @classmethod
+    def bulk_from_ids(cls, station_ids: List[int],
+                      output_base_dir: str = 'sensor_data_by_station',
+                      max_workers: int = 15,
+                      **kwargs) -> List['StationDataDownloader']:
+        """
+        Build downloaders for several stations with two queries in total.
+
+        Stations and their sensors (with sensor types) are loaded up front, so
+        the downloaders don't query them again one by one.
+
+        Args:
+            station_ids: Database IDs of the stations
+            output_base_dir: Base directory for all downloads
+            max_workers: Number of parallel workers for downloads
+            **kwargs: Passed on to the constructor
 
-        # Initialize the OPTIMIZED sensor data downloader
-        self.downloader = GetSensorData(
-            output_dir=str(self.station_dir),
-            max_workers=max_workers
+        Returns:
+            List of downloaders in the order of station_ids; unknown IDs are left out
+        """
+        stations = Station.objects.filter(id__in=station_ids).prefetch_related(
+            Prefetch('sensors', queryset=Sensor.objects.select_related('sensor_type').only(
+                'sensor_id', 'description', 'station', 'sensor_type__name'
+            ))
         )
+        stations_by_id = {station.id: station for station in stations}
 
-        logger.info(f"Initialized OPTIMIZED downloader for station: {self.station.name}")
-        logger.info(f"Output directory: {self.station_dir}")
-        logger.info(f"Parallel workers: {max_workers}")
+        downloaders = []
+        for station_id in station_ids:
+            station = stations_by_id.get(station_id)
+            if station is None:
+                continue
+            downloader = cls(
+                output_base_dir=output_base_dir,
+                max_workers=max_workers,
+                station=station,
+                **kwargs
+            )
+            downloader._cached_sensors = list(station.sensors.all())
+            downloaders.append(downloader)
+        return downloaders
 
     def _get_station(self, station_id: Optional[int],
                      station_uid: Optional[str]) -> Station:
@@ -91,20 +215,39 @@ class StationDataDownloader:
         Create station-specific directory.
         Format: output_base_dir/StationName_StationUID/
         """
-        station_dir_name = (
-            self.station.name.lower()
-            .replace('-', '_')
-            .replace('(', '_')
-            .replace(')', '_')
-            .replace(',', '_')
-            .replace(' ', '_')
-            .strip()
-        )
+        station_dir_name = self.station.name.lower().translate(self._NAME_TRANS).strip()
         station_dir_name = f"{station_dir_name}_{self.station.uid}"
         station_dir = self.output_base_dir / station_dir_name
         station_dir.mkdir(parents=True, exist_ok=True)
         return station_dir
 
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the station's download manifest, or an empty one if unreadable."""
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_completed_months(self, completed_months: Dict[str, Any]):
+        """
+        Add months completed by a sensor download to the manifest and write it.
+
+        The file is replaced atomically so an interrupted write never leaves a
+        truncated manifest behind.
+        """
+        if not completed_months:
+            return
+
+        with _manifest_file_lock, self._manifest_lock:
+            # Other downloaders (e.g. a background task) may have written the
+            # file meanwhile; merge into what is on disk, not over it
+            self._manifest = {**self._load_manifest(), **completed_months}
+            with tempfile.NamedTemporaryFile('w', dir=self.station_dir, suffix='.tmp',
+                                             delete=False, encoding='utf-8') as f:
+                json.dump(self._manifest, f, indent=2, sort_keys=True)
+            os.replace(f.name, self._manifest_path)
+
     def _get_sensor_type(self, sensor_type_name: str) -> Optional[str]:
         """
         Map Django sensor type name to sensor.community format.
@@ -117,13 +260,33 @@ class StationDataDownloader:
         """
         sensor_type_name_lower = sensor_type_name.lower()
 
-        for key, value in self.SENSOR_TYPE_MAP.items():
-            if key in sensor_type_name_lower:
-                return value
+        if sensor_type_name_lower in self._SENSOR_TYPE_EXACT:
+            return self.SENSOR_TYPE_MAP[sensor_type_name_lower]
+
+        match = self._SENSOR_TYPE_RE.search(sensor_type_name_lower)
+        if match:
+            return self.SENSOR_TYPE_MAP[match.group(0)]
 
-        logger.warning(f"Unknown sensor type: {sensor_type_name}")
+        logger.warning("Unknown sensor type: %s", sensor_type_name)
         return None
 
+    def _station_metadata(self) -> Optional[Dict[str, str]]:
+        """
+        Location metadata shared by every sensor of the station.
+
+        Returns:
+            Dictionary with location, lat and lon as strings, or None if the
+            station has no location (metadata is then fetched from the API)
+        """
+        if not self.station.location:
+            return None
+
+        return {
+            'location': self.station.location_name or self.station.name,
+            'lat': str(self.station.location.y),  # latitude
+            'lon': str(self.station.location.x)  # longitude
+        }
+
     def download_all_sensors(self,
                              start_date: str = '2024-01-01',
                              end_date: Optional[str] = None,
@@ -135,6 +298,8 @@ class StationDataDownloader:
         Download data for all sensors in the station or specific sensors if sensor_ids provided.
         OPTIMIZED: Uses parallel downloads for faster performance.
 
+        Collects iter_download_all_sensors() into a dictionary.
+
         Args:
             start_date: Start date in format 'YYYY-MM-DD'
             end_date: End date in format 'YYYY-MM-DD' (defaults to today)
@@ -146,98 +311,202 @@ class StationDataDownloader:
         Returns:
             Dictionary with sensor IDs as keys and download results as values
         """
+        return dict(self.iter_download_all_sensors(
+            start_date=start_date,
+            end_date=end_date,
+            sensor_ids=sensor_ids,
+            merge=merge,
+            create_missing=create_missing,
+            merge_by_year=merge_by_year
+        ))
+
+    def iter_download_all_sensors(self,
+                                  start_date: str = '2024-01-01',
+                                  end_date: Optional[str] = None,
+                                  sensor_ids: Optional[List[int]] = None,
+                                  merge: bool = True,
+                                  create_missing: bool = True,
+                                  merge_by_year: bool = False
+                                  ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Download sensors like download_all_sensors(), yielding each result as
+        soon as its sensor finishes, so callers can persist results as they
+        come in. Closing the generator early cancels sensors not yet started.
+
+        Yields:
+            Tuples of (sensor ID, download result)
+        """
         if end_date is None:
             end_date = datetime.today().strftime('%Y-%m-%d')
 
-        # Set date range
-        self.downloader.set_date_range(start_date, end_date)
-
-        # Get sensors for this station
-        sensors_query = Sensor.objects.filter(
-            station=self.station
-        ).select_related('sensor_type')
+        if sensor_ids:
+            # Drop duplicates (keeping order) so no sensor is downloaded twice
+            sensor_ids = list(dict.fromkeys(sensor_ids))
+
+        if self._cached_sensors is not None:
+            # Sensors were prefetched together with the station
+            sensors = self._cached_sensors
+            if sensor_ids is not None and len(sensor_ids) > 0:
+                wanted = {int(sid) for sid in sensor_ids}
+                sensors = [s for s in sensors if s.sensor_id in wanted]
+                logger.info("Filtering to %d specific sensor(s): %s", len(sensor_ids), sensor_ids)
+        else:
+            # Get sensors for this station
+            # Only the columns used below (station name and type name for str(sensor))
+            sensors_query = Sensor.objects.filter(
+                station=self.station
+            ).select_related('sensor_type', 'station').only(
+                'sensor_id', 'description', 'station__name', 'sensor_type__name'
+            )
 
-        # Filter by specific sensor IDs if provided
-        if sensor_ids is not None and len(sensor_ids) > 0:
-            sensors_query = sensors_query.filter(sensor_id__in=sensor_ids)
-            logger.info(f"Filtering to {len(sensor_ids)} specific sensor(s): {sensor_ids}")
+            # Filter by specific sensor IDs if provided
+            if sensor_ids is not None and len(sensor_ids) > 0:
+                sensors_query = sensors_query.filter(sensor_id__in=sensor_ids)
+                logger.info("Filtering to %d specific sensor(s): %s", len(sensor_ids), sensor_ids)
 
-        sensors = sensors_query
+            # Evaluate the queryset once; the list is reused for the count and the loop
+            sensors = list(sensors_query)
+        total = len(sensors)
 
-        if not sensors.exists():
-            msg = f"No sensors found for station: {self.station.name}"
+        if not sensors:
             if sensor_ids:
-                msg += f" with sensor IDs: {sensor_ids}"
-            logger.warning(msg)
-            return {}
+                logger.warning("No sensors found for station: %s with sensor IDs: %s",
+                               self.station.name, sensor_ids)
+            else:
+                logger.warning("No sensors found for station: %s", self.station.name)
+            return
 
-        logger.info(f"Found {sensors.count()} sensors for station {self.station.name}")
+        logger.info("Found %d sensors for station %s", total, self.station.name)
 
-        results = {}
+        # Station metadata is resolved here, not in the worker threads, since
+        # location_name may queue the geocoding
+        station_metadata = self._station_metadata()
 
-        for idx, sensor in enumerate(sensors, 1):
-            sensor_id = sensor.sensor_id
-            sensor_type = self._get_sensor_type(sensor.sensor_type.name)
+        # Build the shared downloader (and its session) before the workers need it
+        self.downloader
 
-            # Skip if no sensor_id or unknown sensor type
-            if not sensor_id:
-                logger.warning(f"Skipping {sensor} - No sensor_id set")
-                continue
+        with ThreadPoolExecutor(max_workers=self.sensor_workers) as executor:
+            future_to_sensor = {}
 
-            if not sensor_type:
-                logger.warning(
-                    f"Skipping {sensor} - Unknown sensor type: {sensor.sensor_type.name}"
-                )
-                continue
+            for idx, sensor in enumerate(sensors, 1):
+                sensor_id = sensor.sensor_id
+                sensor_type = self._get_sensor_type(sensor.sensor_type.name)
 
-            logger.info(f"[{idx}/{sensors.count()}] Processing: {sensor}")
-            logger.info(f"  Sensor ID: {sensor_id}, Type: {sensor_type}")
+                # Skip if no sensor_id or unknown sensor type
+                if not sensor_id:
+                    logger.warning("Skipping %s - No sensor_id set", sensor)
+                    continue
 
-            try:
-                # Set metadata from station if available
-                if self.station.location:
-                    self.downloader.set_sensor_metadata(
-                        sensor_id=str(sensor_id),
-                        sensor_type=sensor_type,
-                        location=self.station.location_name or self.station.name,
-                        lat=str(self.station.location.y),  # latitude
-                        lon=str(self.station.location.x)  # longitude
+                if not sensor_type:
+                    logger.warning(
+                        "Skipping %s - Unknown sensor type: %s", sensor, sensor.sensor_type.name
                     )
-                    auto_fetch = False
-                else:
-                    auto_fetch = True
-
-                # Download the data with parallel processing
-                result = self.downloader.download_from_date(
-                    sensor_id=str(sensor_id),
-                    sensor_type=sensor_type,
-                    merge=merge,
-                    create_missing=create_missing,
-                    auto_fetch_metadata=auto_fetch,
-                    merge_by_year=merge_by_year
+                    continue
+
+                logger.info("[%d/%d] Processing: %s", idx, total, sensor)
+                logger.info("  Sensor ID: %s, Type: %s", sensor_id, sensor_type)
+
+                sid_s = str(sensor_id)
+
+                # Created here once instead of racing in every worker
+                (self.station_dir / sid_s).mkdir(parents=True, exist_ok=True)
+
+                future = executor.submit(
+                    self._download_sensor,
+                    sid_s,
+                    sensor_type,
+                    station_metadata,
+                    start_date,
+                    end_date,
+                    merge,
+                    create_missing,
+                    merge_by_year
                 )
+                future_to_sensor[future] = (sid_s, sensor)
 
-                results[str(sensor_id)] = {
-                    'sensor': sensor,
-                    'files': result,
-                    'success': True,
-                    'total_files': sum(len(files) for files in result.values())
-                }
+            try:
+                for future in as_completed(future_to_sensor):
+                    sid_s, sensor = future_to_sensor[future]
+
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error("  ✗ Error downloading data for sensor %s: %s", sid_s, e)
+                        yield sid_s, {
+                            'sensor': sensor,
+                            'success': False,
+                            'error': str(e)
+                        }
+                        continue
+
+                    total_files = sum(len(files) for files in result.values())
+
+                    logger.info("  ✓ Downloaded %d files for sensor %s", total_files, sid_s)
+
+                    yield sid_s, {
+                        'sensor': sensor,
+                        'files': result,
+                        'success': True,
+                        'total_files': total_files
+                    }
+            except GeneratorExit:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _download_sensor(self,
+                         sensor_id: str,
+                         sensor_type: str,
+                         station_metadata: Optional[Dict[str, str]],
+                         start_date: str,
+                         end_date: str,
+                         merge: bool,
+                         create_missing: bool,
+                         merge_by_year: bool) -> Dict[str, List[str]]:
+        """
+        Download one sensor (run inside the sensor thread pool).
 
-                logger.info(
-                    f"  ✓ Downloaded {results[str(sensor_id)]['total_files']} "
-                    f"files for sensor {sensor_id}"
-                )
+        Each sensor gets its own GetSensorData, since the sensor metadata lives
+        on the instance, but all of them share the station's HTTP session and
+        semaphore so connections are reused.
+        """
+        downloader = GetSensorData(
+            output_dir=self.station_dir,
+            max_workers=self.max_workers,
+            semaphore=self._semaphore,
+            session=self.downloader.session,
+            use_fast_merge=self.use_fast_merge,
+            merged_format=self.merged_format,
+            manifest=self._manifest_snapshot()
+        )
+        downloader.set_date_range(start_date, end_date)
 
-            except Exception as e:
-                logger.error(f"  ✗ Error downloading data for sensor {sensor_id}: {e}")
-                results[str(sensor_id)] = {
-                    'sensor': sensor,
-                    'success': False,
-                    'error': str(e)
-                }
+        # Set metadata from station if available
+        if station_metadata:
+            downloader.set_sensor_metadata(
+                sensor_id=sensor_id,
+                sensor_type=sensor_type,
+                **station_metadata
+            )
+            auto_fetch = False
+        else:
+            auto_fetch = True
 
-        return results
+        # Download the data with parallel processing
+        result = downloader.download_from_date(
+            sensor_id=sensor_id,
+            sensor_type=sensor_type,
+            merge=merge,
+            create_missing=create_missing,
+            auto_fetch_metadata=auto_fetch,
+            merge_by_year=merge_by_year
+        )
+        self._record_completed_months(downloader.completed_months)
+        return result
+
+    def _manifest_snapshot(self) -> Dict[str, Any]:
+        """Copy of the manifest for one sensor download."""
+        with self._manifest_lock:
+            return dict(self._manifest)
 
     def download_specific_sensor(self,
                                  sensor_id: int,
@@ -265,7 +534,7 @@ class StationDataDownloader:
             end_date = datetime.today().strftime('%Y-%m-%d')
 
         try:
-            sensor = Sensor.objects.get(
+            sensor = Sensor.objects.select_related('sensor_type').get(
                 station=self.station,
                 sensor_id=sensor_id
             )
@@ -279,38 +548,21 @@ class StationDataDownloader:
         if not sensor_type:
             raise ValueError(f"Unknown sensor type: {sensor.sensor_type.name}")
 
-        # Reinitialize downloader with optimized settings
-        self.downloader = GetSensorData(
-            output_dir=str(self.station_dir),
-            max_workers=self.max_workers
-        )
-
-        # Set date range
-        self.downloader.set_date_range(start_date, end_date)
-
-        # Set metadata
-        if self.station.location:
-            self.downloader.set_sensor_metadata(
-                sensor_id=str(sensor_id),
-                sensor_type=sensor_type,
-                location=self.station.location_name or self.station.name,
-                lat=str(self.station.location.y),
-                lon=str(self.station.location.x)
-            )
-            auto_fetch = False
-        else:
-            auto_fetch = True
-
-        logger.info(f"Downloading sensor {sensor_id} to: {self.station_dir}/{sensor_id}/")
-
-        # Download with parallel processing
-        result = self.downloader.download_from_date(
-            sensor_id=str(sensor_id),
-            sensor_type=sensor_type,
-            merge=merge,
-            create_missing=create_missing,
-            auto_fetch_metadata=auto_fetch,
-            merge_by_year=merge_by_year
+        sid_s = str(sensor_id)
+
+        logger.info("Downloading sensor %s to: %s/%s/", sid_s, self.station_dir, sid_s)
+
+        # Per-call downloader state stays in _download_sensor, so one
+        # StationDataDownloader can serve concurrent requests
+        result = self._download_sensor(
+            sid_s,
+            sensor_type,
+            self._station_metadata(),
+            start_date,
+            end_date,
+            merge,
+            create_missing,
+            merge_by_year
         )
 
         return {
@@ -318,7 +570,7 @@ class StationDataDownloader:
             'files': result,
             'success': True,
             'total_files': sum(len(files) for files in result.values()),
-            'output_path': str(self.station_dir / str(sensor_id))
+            'output_path': os.path.join(self._station_dir_str, sid_s)
         }
 
     def get_download_summary(self) -> Dict[str, Any]:
@@ -328,25 +580,27 @@ class StationDataDownloader:
         Returns:
             Dictionary with station info and sensor list
         """
-        sensors = Sensor.objects.filter(
-            station=self.station
-        ).select_related('sensor_type')
+        sensors = list(
+            Sensor.objects.filter(
+                station=self.station
+            ).values('sensor_id', 'sensor_type__name', 'description')
+        )
 
         return {
             'station_name': self.station.name,
             'station_uid': str(self.station.uid),
-            'output_directory': str(self.station_dir),
+            'output_directory': self._station_dir_str,
             'max_workers': self.max_workers,
             'coordinates': {
                 'lat': self.station.location.y if self.station.location else None,
                 'lon': self.station.location.x if self.station.location else None,
             },
-            'total_sensors': sensors.count(),
+            'total_sensors': len(sensors),
             'sensors': [
                 {
-                    'id': s.sensor_id,
-                    'type': s.sensor_type.name,
-                    'description': s.description
+                    'id': s['sensor_id'],
+                    'type': s['sensor_type__name'],
+                    'description': s['description']
                 }
                 for s in sensors
             ]
@@ -408,6 +662,156 @@ def download_station_data(station_id: Optional[int] = None,
     )
 
 
+def _process_one_station(station_id: int,
+                         downloader: Optional[StationDataDownloader],
+                         start_date: str,
+                         end_date: Optional[str],
+                         sensor_ids: Optional[List[int]],
+                         merge: bool,
+                         merge_by_year: bool) -> Tuple[int, Dict[str, Any]]:
+    """
+    Download all sensors of one station (run inside the station thread pool).
+
+    ``downloader`` is None when the station does not exist.
+
+    Returns:
+        Tuple of (station_id, station result dictionary)
+    """
+    prefix = f"[station {station_id}]"
+
+    try:
+        if downloader is None:
+            raise ValueError("Station not found with the provided identifier")
+
+        results = downloader.download_all_sensors(
+            start_date=start_date,
+            end_date=end_date,
+            sensor_ids=sensor_ids,
+            merge=merge,
+            merge_by_year=merge_by_year
+        )
+
+        logger.info(
+            "%s ✓ Completed (%s): %d sensors processed",
+            prefix, downloader.station.name, len(results)
+        )
+
+        return station_id, {
+            'station_id': station_id,
+            'station_name': downloader.station.name,
+            'station_uid': str(downloader.station.uid),
+            'output_directory': str(downloader.station_dir),
+            'sensor_results': results,
+            'success': True,
+            'total_sensors_processed': len(results),
+            'successful_sensors': sum(
+                1 for r in results.values() if r.get('success', False)
+            ),
+            'failed_sensors': sum(
+                1 for r in results.values() if not r.get('success', False)
+            )
+        }
+
+    except Exception as e:
+        logger.error("%s ✗ Error processing station: %s", prefix, e)
+        return station_id, {
+            'station_id': station_id,
+            'success': False,
+            'error': str(e)
+        }
+
+    finally:
+        # Worker threads get their own DB connection; don't leak it
+        connection.close()
+
+
+def _station_pk(station_id: Any) -> Optional[int]:
+    """``station_id`` as an int, or None if it isn't a valid ID."""
+    try:
+        return int(station_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_download_stations(
+        station_ids: List[int],
+        start_date: str = '2024-01-01',
+        end_date: Optional[str] = None,
+        sensor_ids: Optional[List[int]] = None,
+        merge: bool = True,
+        merge_by_year: bool = False,
+        output_dir: str = 'sensor_data_by_station',
+        max_workers: int = 15,
+        outer_workers: int = 4,
+        max_total_workers: int = 30
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Download several stations concurrently, yielding each station result of
+    _process_one_station() as soon as the station finishes.
+
+    The station, sensor and date pools are sized with pool_sizes() and share
+    one semaphore and HTTP session, so at most ``max_total_workers`` dates
+    download at once across all stations.
+
+    IDs that aren't integers (e.g. from a request body) fail like unknown
+    stations, without affecting the other stations.
+
+    Yields:
+        Tuples of (station_id, station result dictionary)
+    """
+    station_pks = [(station_id, _station_pk(station_id)) for station_id in station_ids]
+
+    station_workers, sensor_workers, date_workers = pool_sizes(
+        len(station_ids), max_total_workers, outer_workers
+    )
+    date_workers = min(date_workers, max_workers)
+
+    logger.info(
+        "Processing up to %d stations, %d sensors each, %d dates per sensor "
+        "at once (max %d concurrent downloads)",
+        station_workers, sensor_workers, date_workers, max_total_workers
+    )
+
+    semaphore = threading.BoundedSemaphore(max_total_workers)
+
+    # One keep-alive pool for all stations, sized for the concurrent downloads
+    session = GetSensorData.create_session(pool_maxsize=max_total_workers)
+
+    try:
+        # Stations and their sensors are loaded in two queries for all stations
+        downloaders = {
+            downloader.station.id: downloader
+            for downloader in StationDataDownloader.bulk_from_ids(
+                [pk for _, pk in station_pks if pk is not None],
+                output_base_dir=output_dir,
+                max_workers=date_workers,
+                sensor_workers=sensor_workers,
+                semaphore=semaphore,
+                session=session
+            )
+        }
+
+        with ThreadPoolExecutor(max_workers=station_workers) as executor:
+            futures = [
+                executor.submit(
+                    _process_one_station,
+                    station_id,
+                    downloaders.get(pk),
+                    start_date,
+                    end_date,
+                    sensor_ids,
+                    merge,
+                    merge_by_year
+                )
+                for station_id, pk in station_pks
+            ]
+
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        session.close()
+
+
 def download_multiple_stations_data(
         station_ids: Optional[Union[int, List[int]]] = None,
         start_date: str = '2024-01-01',
@@ -416,12 +820,20 @@ def download_multiple_stations_data(
         merge: bool = True,
         merge_by_year: bool = False,
         output_dir: str = 'sensor_data_by_station',
-        max_workers: int = 15
+        max_workers: int = 15,
+        outer_workers: int = 4,
+        max_total_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Download sensor data for single or multiple stations.
     OPTIMIZED VERSION with parallel downloads.
 
+    Stations are processed concurrently in a thread pool of up to
+    ``outer_workers`` threads. The station, sensor and date pools are sized
+    with pool_sizes() so that together they run at most ``max_total_workers``
+    downloads, the cap shared by all stations so sensor.community is not
+    flooded.
+
     Args:
         station_ids: Single station ID or list of station database IDs
         start_date: Start date in format 'YYYY-MM-DD'
@@ -430,7 +842,10 @@ def download_multiple_stations_data(
         merge: If True, merge monthly CSV files
         merge_by_year: If True, merge all months into yearly files
         output_dir: Base directory for all downloads
-        max_workers: Number of parallel workers per station (default: 15)
+        max_workers: Maximum number of parallel date downloads per sensor (default: 15)
+        outer_workers: Number of stations processed at the same time (default: 4)
+        max_total_workers: Cap on concurrent date downloads across all stations
+            (default: 2 * max_workers)
 
     Returns:
         Dictionary with station identifiers as keys and download results as values
@@ -453,68 +868,33 @@ def download_multiple_stations_data(
     if station_ids is not None and not isinstance(station_ids, list):
         station_ids = [station_ids]
 
-    all_results = {}
-
-    # Process station IDs
-    if station_ids:
-        logger.info(f"Processing {len(station_ids)} station(s) by ID")
-        logger.info(f"Using {max_workers} parallel workers per station")
-        if sensor_ids:
-            logger.info(f"Filtering to specific sensor IDs: {sensor_ids}")
-
-        for idx, station_id in enumerate(station_ids, 1):
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"Station {idx}/{len(station_ids)}: ID={station_id}")
-            logger.info(f"{'=' * 60}")
-
-            try:
-                downloader = StationDataDownloader(
-                    station_id=station_id,
-                    output_base_dir=output_dir,
-                    max_workers=max_workers
-                )
+    if max_total_workers is None:
+        max_total_workers = max_workers * 2
 
-                results = downloader.download_all_sensors(
-                    start_date=start_date,
-                    end_date=end_date,
-                    sensor_ids=sensor_ids,
-                    merge=merge,
-                    merge_by_year=merge_by_year
-                )
-
-                all_results[f"station_{station_id}"] = {
-                    'station_id': station_id,
-                    'station_name': downloader.station.name,
-                    'station_uid': str(downloader.station.uid),
-                    'output_directory': str(downloader.station_dir),
-                    'sensor_results': results,
-                    'success': True,
-                    'total_sensors_processed': len(results),
-                    'successful_sensors': sum(
-                        1 for r in results.values() if r.get('success', False)
-                    ),
-                    'failed_sensors': sum(
-                        1 for r in results.values() if not r.get('success', False)
-                    )
-                }
-
-                logger.info(
-                    f"✓ Completed station {station_id} ({downloader.station.name}): "
-                    f"{len(results)} sensors processed"
-                )
-
-            except Exception as e:
-                logger.error(f"✗ Error processing station {station_id}: {e}")
-                all_results[f"station_{station_id}"] = {
-                    'station_id': station_id,
-                    'success': False,
-                    'error': str(e)
-                }
+    logger.info("Processing %d station(s) by ID", len(station_ids))
+    if sensor_ids:
+        logger.info("Filtering to specific sensor IDs: %s", sensor_ids)
+
+    all_results = {
+        f"station_{station_id}": station_result
+        for station_id, station_result in iter_download_stations(
+            station_ids,
+            start_date=start_date,
+            end_date=end_date,
+            sensor_ids=sensor_ids,
+            merge=merge,
+            merge_by_year=merge_by_year,
+            output_dir=output_dir,
+            max_workers=max_workers,
+            outer_workers=outer_workers,
+            max_total_workers=max_total_workers
+        )
+    }
 
     # Print summary
-    logger.info(f"\n{'=' * 60}")
+    logger.info("\n%s", '=' * 60)
     logger.info("DOWNLOAD SUMMARY")
-    logger.info(f"{'=' * 60}")
+    logger.info('=' * 60)
     successful = sum(1 for r in all_results.values() if r.get('success', False))
     failed = len(all_results) - successful
     total_sensors = sum(
@@ -522,13 +902,12 @@ def download_multiple_stations_data(
         for r in all_results.values()
         if r.get('success', False)
     )
-    logger.info(f"Total stations: {len(all_results)}")
-    logger.info(f"Successful: {successful}")
-    logger.info(f"Failed: {failed}")
-    logger.info(f"Total sensors processed: {total_sensors}")
-    logger.info(f"Parallel workers used: {max_workers}")
+    logger.info("Total stations: %d", len(all_results))
+    logger.info("Successful: %d", successful)
+    logger.info("Failed: %d", failed)
+    logger.info("Total sensors processed: %d", total_sensors)
     if sensor_ids:
-        logger.info(f"Filtered to sensor IDs: {sensor_ids}")
-    logger.info(f"{'=' * 60}\n")
+        logger.info("Filtered to sensor IDs: %s", sensor_ids)
+    logger.info("%s\n", '=' * 60)
 
-    return all_results
\ No newline at end of file
+    return all_results
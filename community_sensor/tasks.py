@@ -0,0 +1,97 @@
+"""
+Background tasks for downloading sensor data organized by station.
+"""
+from core.tasks import update_progress
+
+from .station_data_downloader import iter_download_stations
+
+
+# Stations downloaded at the same time, and the cap on concurrent date
+# downloads shared by all of them
+STATION_WORKERS = 8
+MAX_TOTAL_DOWNLOADS = 30
+
+
+def _task_result(station_id, station_result, sensor_ids):
+    """Per-station entry of the task result, as sent to the frontend."""
+    if not station_result['success']:
+        return f'Station_{station_id}', {
+            'success': False,
+            'error': station_result['error']
+        }
+
+    return station_result['station_name'], {
+        'success': True,
+        'total_sensors': station_result['total_sensors_processed'],
+        'successful_sensors': station_result['successful_sensors'],
+        'output_path': station_result['output_directory'],
+        'filtered': sensor_ids is not None and len(sensor_ids) > 0
+    }
+
+
+def download_stations_task(task_id, station_ids, sensor_ids, start_date, end_date,
+                           merge, merge_by_year):
+    """
+    Download data for the selected stations (run through core.tasks.submit).
+
+    Stations are downloaded in parallel; progress is reported as
+    ``done``/``total`` stations.
+
+    Returns:
+        Dictionary with message, summary, per-station results and station_path,
+        as sent to the frontend
+    """
+    # Results container
+    all_results = {}
+    successful_stations = 0
+    failed_stations = 0
+    total_sensors_downloaded = 0
+
+    update_progress(task_id, done=0, total=len(station_ids))
+
+    # Download data for the selected stations
+    downloads = iter_download_stations(
+        station_ids,
+        start_date=start_date,
+        end_date=end_date,
+        sensor_ids=sensor_ids,
+        merge=merge,
+        merge_by_year=merge_by_year,
+        outer_workers=STATION_WORKERS,
+        max_total_workers=MAX_TOTAL_DOWNLOADS
+    )
+    for done, (station_id, station_result) in enumerate(downloads, 1):
+        key, result = _task_result(station_id, station_result, sensor_ids)
+        all_results[key] = result
+
+        if result['success']:
+            successful_stations += 1
+            total_sensors_downloaded += result['successful_sensors']
+        else:
+            failed_stations += 1
+
+        update_progress(task_id, done=done, total=len(station_ids))
+
+    # Prepare success message
+    if sensor_ids and len(sensor_ids) > 0:
+        message = f"Downloaded data for {total_sensors_downloaded} selected sensor(s) from {successful_stations} station(s)"
+    else:
+        message = f"Downloaded data for {total_sensors_downloaded} sensors from {successful_stations} station(s)"
+
+    if failed_stations > 0:
+        message += f". {failed_stations} station(s) failed."
+
+    return {
+        'success': True,
+        'message': message,
+        'summary': {
+            'total_stations': len(station_ids),
+            'successful_stations': successful_stations,
+            'failed_stations': failed_stations,
+            'total_sensors': total_sensors_downloaded,
+            'filtered_download': sensor_ids is not None and len(sensor_ids) > 0
+        },
+        'results': all_results,
+        # The downloads have just written into the station folder
+        'station_path': True,
+    }
@@ -26,6 +26,7 @@ from . import views
 
 urlpatterns = [
     path('download/station/', views.download_station_data, name='download_station_data'),
+    path('download/status/<str:task_id>/', views.download_status, name='download_status'),
     path('download/sensor/', views.download_specific_sensor, name='download_sensor_data'),
     # path('download/progress/', views.get_download_progress, name='download_progress'),
 
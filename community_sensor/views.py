@@ -2,24 +2,47 @@
 Django views for downloading sensor data organized by station.
 Add these to your views.py file.
 """
+import codecs
 import csv
+import functools
+import io
 import os
 
-from django.http import JsonResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
 from datetime import datetime
 from django.shortcuts import render
-import json
+import orjson
 
 from django.views.generic import View
 
-# Import your models
-from sensor.models import Station
+from core import tasks
 
 # Import the downloader utility
+from sensor.get_sensor_data import GetSensorData
 from .station_data_downloader import StationDataDownloader
+from .tasks import download_stations_task
+
+
+def _json_response(data, status=200):
+    """JSON response serialized with orjson (faster than the stdlib encoder)."""
+    return HttpResponse(orjson.dumps(data), content_type='application/json', status=status)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_session():
+    """HTTP session shared by the request downloaders of this worker process."""
+    return GetSensorData.create_session()
+
+
+def _get_downloader(station_id):
+    """
+    StationDataDownloader of a station, built per request so the station and
+    its manifest are current; only the HTTP session is reused across requests.
+    """
+    return StationDataDownloader(station_id=station_id, session=_get_session())
 
 
 @login_required
@@ -29,10 +52,13 @@ def download_station_data(request):
     Handle download data requests from the frontend.
     Supports both single station and multiple station downloads.
     Now also supports downloading only selected sensors.
+
+    Starts a background task and returns its id; progress and the final
+    result are read from download_status.
     """
     try:
         # Get parameters from request
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         station_ids = data.get('station_ids', [])
         sensor_ids = data.get('sensor_ids', None)  # NEW: Get selected sensor IDs
         start_date = data.get('start_date', '2024-01-01')
@@ -41,100 +67,75 @@ def download_station_data(request):
         merge_by_year = data.get('merge_by_year', True)
 
         if not station_ids:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'error': 'No stations selected'
             }, status=400)
 
-        # Results container
-        all_results = {}
-        successful_stations = 0
-        failed_stations = 0
-        total_sensors_downloaded = 0
-        station_path = os.path.join(settings.BASE_DIR, 'sensor_data_by_station')
-
-        # Download data for each selected station
-        for station_id in station_ids:
-            try:
-                station = Station.objects.get(id=station_id)
-
-                # Initialize downloader
-                downloader = StationDataDownloader(station_id=station_id)
-
-                # Download sensors for this station
-                # If sensor_ids provided, only download those; otherwise download all
-                results = downloader.download_all_sensors(
-                    start_date=start_date,
-                    end_date=end_date,
-                    sensor_ids=sensor_ids,  # NEW: Pass selected sensor IDs
-                    merge=merge,
-                    merge_by_year=merge_by_year
-                )
-
-                # Count successful sensor downloads
-                successful_sensors = sum(1 for r in results.values() if r.get('success'))
-                total_sensors_downloaded += successful_sensors
-
-                all_results[station.name] = {
-                    'success': True,
-                    'total_sensors': len(results),
-                    'successful_sensors': successful_sensors,
-                    'output_path': str(downloader.station_dir),
-                    'filtered': sensor_ids is not None and len(sensor_ids) > 0  # NEW: Indicate if filtered
-                }
-
-                successful_stations += 1
-
-            except Station.DoesNotExist:
-                all_results[f'Station_{station_id}'] = {
-                    'success': False,
-                    'error': 'Station not found'
-                }
-                failed_stations += 1
-
-            except Exception as e:
-                all_results[f'Station_{station_id}'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-                failed_stations += 1
-
-        # Prepare success message
-        if sensor_ids and len(sensor_ids) > 0:
-            message = f"Downloaded data for {total_sensors_downloaded} selected sensor(s) from {successful_stations} station(s)"
-        else:
-            message = f"Downloaded data for {total_sensors_downloaded} sensors from {successful_stations} station(s)"
-
-        if failed_stations > 0:
-            message += f". {failed_stations} station(s) failed."
-
-        return JsonResponse({
+        # The download runs in the background; the frontend polls download_status
+        task_id = tasks.submit(
+            download_stations_task,
+            station_ids,
+            sensor_ids,
+            start_date,
+            end_date,
+            merge,
+            merge_by_year,
+            owner=request.user.id,
+            queue='downloads'
+        )
+
+        return _json_response({
             'success': True,
-            'message': message,
-            'summary': {
-                'total_stations': len(station_ids),
-                'successful_stations': successful_stations,
-                'failed_stations': failed_stations,
-                'total_sensors': total_sensors_downloaded,
-                'filtered_download': sensor_ids is not None and len(sensor_ids) > 0  # NEW
-            },
-            'results': all_results,
-            'station_path': os.path.exists(station_path),
-        })
+            'task_id': task_id,
+            'message': f"Download started for {len(station_ids)} station(s)"
+        }, status=202)
 
-    except json.JSONDecodeError:
-        return JsonResponse({
+    except orjson.JSONDecodeError:
+        return _json_response({
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
 
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'error': str(e)
         }, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+def download_status(request, task_id):
+    """
+    Return the state of a background download started by download_station_data.
+    When finished, the download result is included in the response.
+    """
+    status = tasks.get_status(task_id)
+
+    if status is None or status.get('owner') != request.user.id:
+        return _json_response({
+            'success': False,
+            'error': 'Task not found'
+        }, status=404)
+
+    return _json_response(_status_response(status))
+
+
+def _status_response(status):
+    """Response data of a download task status; includes the result when finished."""
+    response = {
+        'state': status['state'],
+        'done': status.get('done'),
+        'total': status.get('total'),
+    }
+    if status['state'] == 'SUCCESS':
+        response.update(status['result'])
+    elif status['state'] == 'FAILURE':
+        response.update({'success': False, 'error': status['error']})
+    return response
+
+
 @login_required
 @require_http_methods(["POST"])
 def download_specific_sensor(request):
@@ -142,7 +143,7 @@ def download_specific_sensor(request):
     Download data for a specific sensor within a station.
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         station_id = data.get('station_id')
         sensor_id = data.get('sensor_id')
         start_date = data.get('start_date', '2024-01-01')
@@ -151,14 +152,13 @@ def download_specific_sensor(request):
         merge_by_year = data.get('merge_by_year', True)
 
         if not station_id or not sensor_id:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'error': 'Station ID and Sensor ID are required'
             }, status=400)
 
-        # Initialize downloader
-        downloader = StationDataDownloader(station_id=station_id)
-        station_path = os.path.join(settings.BASE_DIR, 'sensor_data_by_station')
+        # Fresh downloader sharing the worker's HTTP session
+        downloader = _get_downloader(int(station_id))
 
         # Download specific sensor
         result = downloader.download_specific_sensor(
@@ -169,7 +169,7 @@ def download_specific_sensor(request):
             merge_by_year=merge_by_year
         )
 
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'message': f"Downloaded {result['total_files']} files for sensor {sensor_id}",
             'result': {
@@ -177,17 +177,18 @@ def download_specific_sensor(request):
                 'total_files': result['total_files'],
                 'output_path': result['output_path']
             },
-            'station_path': os.path.exists(station_path),
+            # The download has just written into the station folder
+            'station_path': True,
         })
 
     except ValueError as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'error': str(e)
         }, status=400)
 
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -201,22 +202,22 @@ def get_station_download_info(request, station_id):
     Useful for showing a confirmation dialog before downloading.
     """
     try:
-        downloader = StationDataDownloader(station_id=station_id)
+        downloader = _get_downloader(station_id)
         summary = downloader.get_download_summary()
 
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'station': summary
         })
 
     except ValueError as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'error': str(e)
         }, status=400)
 
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -227,120 +228,172 @@ def get_sensor_data_path():
     """Get absolute path to sensor_data_by_station folder"""
     return os.path.join(settings.BASE_DIR, 'sensor_data_by_station')
 
-def safe_path(user_path):
+def safe_path(user_path, base=None):
     """Prevent directory traversal - ensure path stays within base directory"""
-    base = os.path.abspath(get_sensor_data_path())
+    base = os.path.abspath(base or get_sensor_data_path())
     requested = os.path.abspath(os.path.join(base, user_path))
 
     if not requested.startswith(base):
         raise ValueError("Invalid path")
     return requested
 
+def _count_entries(path):
+    """Number of entries in a directory, or 0 if it can't be read."""
+    try:
+        with os.scandir(path) as it:
+            return sum(1 for _ in it)
+    except OSError:
+        return 0
+
+
+def _name_key(item):
+    return item['name'].lower()
+
+
 class StationDataListView(View):
-    """List folders and CSV files"""
+    """
+    List folders and CSV files.
+    Folder item counts can be skipped with ``?counts=0``.
+    """
 
     def get(self, request):
         path = request.GET.get('path', '')
+        with_counts = request.GET.get('counts', '1') != '0'
 
         try:
-            full_path = safe_path(path)
+            base = get_sensor_data_path()
+            full_path = safe_path(path, base)
 
             if not os.path.isdir(full_path):
-                return JsonResponse({'error': 'Directory not found'}, status=404)
+                return _json_response({'error': 'Directory not found'}, status=404)
 
-            items = []
+            folders = []
+            files = []
             stats = {'folders': 0, 'files': 0}
+            fromtimestamp = datetime.fromtimestamp
+
+            # Relative path of the listed folder, computed once for all entries
+            rel_dir = os.path.relpath(full_path, base)
+            if os.sep != '/':
+                rel_dir = rel_dir.replace(os.sep, '/')
+            rel_prefix = '' if rel_dir == '.' else rel_dir + '/'
+
+            with os.scandir(full_path) as entries:
+                for entry in entries:
+                    # Cached d_type from the directory listing, no extra stat
+                    is_dir = entry.is_dir(follow_symlinks=False)
 
-            for entry in os.scandir(full_path):
-                rel_path = os.path.relpath(entry.path, get_sensor_data_path()).replace('\\', '/')
-
-                item = {
-                    'name': entry.name,
-                    'path': rel_path,
-                    'type': 'folder' if entry.is_dir() else 'file',
-                }
-
-                if entry.is_dir():
-                    stats['folders'] += 1
-                    try:
-                        item['item_count'] = len(os.listdir(entry.path))
-                    except:
-                        item['item_count'] = 0
-                else:
                     # Only show CSV files
-                    if not entry.name.lower().endswith('.csv'):
+                    if not is_dir and not entry.name.lower().endswith('.csv'):
                         continue
 
-                    stats['files'] += 1
-                    stat = entry.stat()
-                    item['size'] = stat.st_size
-                    item['modified'] = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-
-                items.append(item)
+                    item = {
+                        'name': entry.name,
+                        'path': rel_prefix + entry.name,
+                        'type': 'folder' if is_dir else 'file',
+                    }
+
+                    if is_dir:
+                        stats['folders'] += 1
+                        if with_counts:
+                            item['item_count'] = _count_entries(entry.path)
+                        folders.append(item)
+                    else:
+                        stats['files'] += 1
+                        stat = entry.stat(follow_symlinks=False)
+                        item['size'] = stat.st_size
+                        item['modified'] = fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
+                        files.append(item)
 
             # Sort: folders first, then alphabetical
-            items.sort(key=lambda x: (0 if x['type'] == 'folder' else 1, x['name'].lower()))
+            folders.sort(key=_name_key)
+            files.sort(key=_name_key)
+            items = folders + files
 
-            return JsonResponse({
+            return _json_response({
                 'items': items,
                 'stats': stats
             })
 
         except ValueError:
-            return JsonResponse({'error': 'Invalid path'}, status=400)
+            return _json_response({'error': 'Invalid path'}, status=400)
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
+
+
+# Read buffer for CSV files shown in the viewer (fewer read syscalls)
+CSV_READ_BUFFER_SIZE = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=512)
+def _sniff_dialect(path, mtime):
+    """
+    Detect the CSV dialect of a file from its first 4 KB.
+    ``mtime`` is only part of the cache key, so a changed file is sniffed again.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(4096)
+    sample = sample.removeprefix(codecs.BOM_UTF8).decode('utf-8', errors='replace')
+
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',\t;')
+    except csv.Error:
+        return csv.excel
+
 
 class CsvViewerView(View):
-    """Parse CSV and return JSON data for viewing"""
+    """
+    Parse CSV and stream it as NDJSON for viewing.
+
+    The first line is ``{"headers": [...]}``, every following line one row
+    as a list of values in header order. An error while reading is sent as a final
+    ``{"error": ...}`` line.
+    """
 
     def get(self, request):
         path = request.GET.get('path', '')
 
         try:
             full_path = safe_path(path)
+        except ValueError:
+            return _json_response({'error': 'Invalid path'}, status=400)
 
-            if not os.path.isfile(full_path) or not full_path.endswith('.csv'):
-                return JsonResponse({'error': 'CSV file not found'}, status=404)
-
-            rows = []
-            headers = []
-
-            with open(full_path, 'r', encoding='utf-8-sig', errors='replace') as f:
-                # Detect CSV dialect
-                sample = f.read(4096)
-                f.seek(0)
-
-                try:
-                    dialect = csv.Sniffer().sniff(sample, delimiters=',\t;')
-                except:
-                    dialect = csv.excel
-
-                reader = csv.DictReader(f, dialect=dialect)
-                headers = reader.fieldnames or []
-
-                for row in reader:
-                    # Clean row data
-                    clean_row = {}
-                    for k, v in row.items():
-                        if k is not None:
-                            clean_row[k.strip()] = v.strip() if v else ''
-                    rows.append(clean_row)
-
-                    # Limit for performance
-                    if len(rows) >= 100000:
-                        break
-
-            return JsonResponse({
-                'success': True,
-                'headers': headers,
-                'rows': rows
-            })
+        if not os.path.isfile(full_path) or not full_path.endswith('.csv'):
+            return _json_response({'error': 'CSV file not found'}, status=404)
+
+        return StreamingHttpResponse(
+            self._stream_rows(full_path),
+            content_type='application/x-ndjson'
+        )
+
+    @staticmethod
+    def _stream_rows(full_path):
+        try:
+            # Detect CSV dialect (cached until the file changes)
+            dialect = _sniff_dialect(full_path, os.path.getmtime(full_path))
+
+            with open(full_path, 'rb', buffering=CSV_READ_BUFFER_SIZE) as raw:
+                # Skip the UTF-8 BOM
+                if raw.peek(len(codecs.BOM_UTF8)).startswith(codecs.BOM_UTF8):
+                    raw.read(len(codecs.BOM_UTF8))
+
+                with io.TextIOWrapper(raw, encoding='utf-8', errors='replace', newline='') as f:
+                    reader = csv.reader(f, dialect=dialect)
+                    headers = [h.strip() for h in next(reader, [])]
+                    yield orjson.dumps({'headers': headers}) + b'\n'
+
+                    # Rows are sent in batches to keep the number of writes low
+                    batch = []
+                    for row in reader:
+                        batch.append(orjson.dumps([v.strip() for v in row]))
+                        if len(batch) >= 1000:
+                            yield b'\n'.join(batch) + b'\n'
+                            batch = []
+                    if batch:
+                        yield b'\n'.join(batch) + b'\n'
 
-        except ValueError:
-            return JsonResponse({'error': 'Invalid path'}, status=400)
         except Exception as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            yield orjson.dumps({'error': str(e)}) + b'\n'
 
 def station_data_manager(request):
     """Render file manager page"""
@@ -0,0 +1,17 @@
+from django.core.checks import Error, register
+
+from .tasks import cache_is_shared
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Background task status must be visible to every worker process."""
+    if cache_is_shared():
+        return []
+    return [Error(
+        "The default cache is process-local, so background task status "
+        "can't be polled from other worker processes.",
+        hint="Set CACHE_URL to a shared cache, e.g. filecache:///var/tmp/sensolog "
+             "or redis://127.0.0.1:6379/1.",
+        id='core.E001',
+    )]
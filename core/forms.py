@@ -2,7 +2,6 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django import forms
 from django.contrib.auth.forms import PasswordChangeForm
-from django.contrib.auth import password_validation
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -31,43 +30,40 @@ class CustomUserCreationForm(UserCreationForm):
         })
 
 
+# Shared Tailwind classes of the password inputs
+_PASSWORD_INPUT_CLASS = 'w-full px-4 py-3 bg-slate-900/50 border border-white/10 rounded-xl text-slate-200 placeholder-slate-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all'
+
+
+def _pw_attrs(placeholder, autocomplete):
+    return {
+        'class': _PASSWORD_INPUT_CLASS,
+        'placeholder': placeholder,
+        'autocomplete': autocomplete,
+    }
+
+
 class CustomPasswordChangeForm(PasswordChangeForm):
     """
-    Custom password change form with styled fields
+    Custom password change form with styled fields.
+    Help texts are left out for a cleaner UI.
     """
     old_password = forms.CharField(
         label="Current Password",
         strip=False,
-        widget=forms.PasswordInput(attrs={
-            'class': 'w-full px-4 py-3 bg-slate-900/50 border border-white/10 rounded-xl text-slate-200 placeholder-slate-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all',
-            'placeholder': 'Enter your current password',
-            'autocomplete': 'current-password',
-        }),
+        widget=forms.PasswordInput(attrs=_pw_attrs('Enter your current password', 'current-password')),
+        help_text=None,
     )
 
     new_password1 = forms.CharField(
         label="New Password",
         strip=False,
-        widget=forms.PasswordInput(attrs={
-            'class': 'w-full px-4 py-3 bg-slate-900/50 border border-white/10 rounded-xl text-slate-200 placeholder-slate-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all',
-            'placeholder': 'Enter your new password',
-            'autocomplete': 'new-password',
-        }),
-        help_text=password_validation.password_validators_help_text_html(),
+        widget=forms.PasswordInput(attrs=_pw_attrs('Enter your new password', 'new-password')),
+        help_text=None,
     )
 
     new_password2 = forms.CharField(
         label="Confirm New Password",
         strip=False,
-        widget=forms.PasswordInput(attrs={
-            'class': 'w-full px-4 py-3 bg-slate-900/50 border border-white/10 rounded-xl text-slate-200 placeholder-slate-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all',
-            'placeholder': 'Confirm your new password',
-            'autocomplete': 'new-password',
-        }),
+        widget=forms.PasswordInput(attrs=_pw_attrs('Confirm your new password', 'new-password')),
+        help_text=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Remove help text for cleaner UI (optional)
-        for field_name in self.fields:
-            self.fields[field_name].help_text = None
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-15 09:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coresensortype',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='coresensortype_name_lower_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
@@ -27,5 +28,11 @@ class CoreSensorType(models.Model):
    name = models.CharField(max_length=255)
    description = models.TextField()
 
+   class Meta:
+      indexes = [
+         # Sensor types are looked up case-insensitively by name
+         models.Index(Lower('name'), name='coresensortype_name_lower_idx'),
+      ]
+
    def __str__(self):
       return self.name
@@ -1,3 +1,21 @@
+/**
+ * Poll the status of a background refresh until it has finished.
+ */
+async function waitForRefreshTask(taskId, interval = 2000) {
+    const url = REFRESH_STATUS_URL.replace("TASK_ID", encodeURIComponent(taskId));
+
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, interval));
+
+        const response = await fetch(url);
+        const status = await response.json();
+
+        if (status.state === "SUCCESS" || status.state === "FAILURE" || !response.ok) {
+            return status;
+        }
+    }
+}
+
 function refreshData() {
     const csrfToken = document.getElementById("csrfToken").value;
 
@@ -12,8 +30,10 @@ function refreshData() {
         },
     })
     .then(response => response.json())
+    // The refresh runs in the background; wait for it to finish
+    .then(data => data.task_id ? waitForRefreshTask(data.task_id) : data)
     .then(data => {
-        if (data.status === "ok") {
+        if (data.state === "SUCCESS") {
             alert("✅ Sensor data refreshed!");
         } else {
             alert("⚠️ Failed to refresh sensor data");
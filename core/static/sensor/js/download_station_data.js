@@ -417,6 +417,33 @@ function closeDownloadModal() {
     }, 200);
 }
 
+/**
+ * Poll the status of a background download until it has finished.
+ * Returns the final status, which carries the download result.
+ */
+async function waitForDownloadTask(taskId, interval = 2000) {
+    const url = DOWNLOAD_STATUS_URL.replace('TASK_ID', encodeURIComponent(taskId));
+
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, interval));
+
+        const response = await fetch(url);
+        const status = await response.json();
+
+        if (status.state === 'SUCCESS' || status.state === 'FAILURE' || !response.ok) {
+            return status;
+        }
+
+        // Show progress in the overlay
+        if (status.total) {
+            const progressText = document.querySelector('#downloadProgressOverlay .text-xs');
+            if (progressText) {
+                progressText.textContent = `${status.done} of ${status.total} station(s) done...`;
+            }
+        }
+    }
+}
+
 /**
  * Execute the station download with given configuration
  */
@@ -436,7 +463,12 @@ async function executeDownload(config) {
             body: JSON.stringify(config)
         });
 
-        const data = await response.json();
+        let data = await response.json();
+
+        // The download runs in the background; wait for it to finish
+        if (data.task_id) {
+            data = await waitForDownloadTask(data.task_id);
+        }
 
         if (data.success) {
             showToast(data.message, 'success');
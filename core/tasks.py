@@ -0,0 +1,122 @@
+"""
+Minimal in-process background tasks.
+
+Long-running work (e.g. sensor data downloads) is run in a small thread pool
+instead of the request thread. The view gets a task id back right away and
+the frontend polls the task status, which is kept in the Django cache under
+``task:<id>``.
+
+The status is only visible to other worker processes through a shared cache
+backend (see CACHE_URL). With a process-local cache a poll served by another
+worker could never find the task, so such a cache is refused: by the
+core.E001 system check at startup, and by submit().
+
+Work whose status nobody polls (e.g. geocoding) goes through defer() and
+always runs in the background.
+"""
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# How long a task status is kept in the cache (seconds)
+TASK_STATUS_TIMEOUT = 60 * 60 * 24
+
+# Cache backends whose entries other processes can't see
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Long downloads get their own threads, so they don't wait behind (or block)
+# the short tasks
+_executors = {
+    'default': ThreadPoolExecutor(max_workers=2, thread_name_prefix='task'),
+    'downloads': ThreadPoolExecutor(max_workers=2, thread_name_prefix='download'),
+}
+
+
+def _status_key(task_id):
+    return f'task:{task_id}'
+
+
+def _set_status(task_id, status):
+    cache.set(_status_key(task_id), status, TASK_STATUS_TIMEOUT)
+
+
+def cache_is_shared():
+    """True if the default cache backend is visible to all worker processes."""
+    return settings.CACHES[DEFAULT_CACHE_ALIAS]['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+def submit(fn, *args, owner=None, queue='default', **kwargs):
+    """
+    Run ``fn(task_id, *args, **kwargs)`` in the background, with its status
+    in the (shared) cache for polling.
+
+    Args:
+        fn: Task function; gets the task id as first argument so it can
+            report progress with update_progress()
+        owner: Optional user id stored with the status, for permission checks
+        queue: Executor to run on, 'default' or 'downloads'
+
+    Returns:
+        Task id
+
+    Raises:
+        ImproperlyConfigured: If the cache backend is process-local
+    """
+    if not cache_is_shared():
+        raise ImproperlyConfigured(
+            "Background tasks need a cache shared by all worker processes; "
+            "set CACHE_URL (see sensolog/settings.py)."
+        )
+
+    task_id = uuid.uuid4().hex
+    _set_status(task_id, {'state': 'PENDING', 'owner': owner})
+    _executors[queue].submit(_run, task_id, owner, fn, args, kwargs)
+    return task_id
+
+
+def defer(fn, *args, **kwargs):
+    """
+    Run ``fn(task_id, *args, **kwargs)`` in the background; for work whose
+    status is never polled, so it doesn't need a shared cache.
+
+    Returns:
+        Task id
+    """
+    task_id = uuid.uuid4().hex
+    _executors['default'].submit(_run, task_id, None, fn, args, kwargs)
+    return task_id
+
+
+def update_progress(task_id, **meta):
+    """Store progress information (e.g. ``done`` and ``total``) for a running task."""
+    status = get_status(task_id) or {}
+    _set_status(task_id, {'state': 'PROGRESS', 'owner': status.get('owner'), **meta})
+
+
+def get_status(task_id):
+    """Return the status dictionary of a task, or None if it is unknown or expired."""
+    return cache.get(_status_key(task_id))
+
+
+def _run(task_id, owner, fn, args, kwargs):
+    _set_status(task_id, {'state': 'STARTED', 'owner': owner})
+    try:
+        result = fn(task_id, *args, **kwargs)
+    except Exception as e:
+        logger.exception("Task %s failed", task_id)
+        _set_status(task_id, {'state': 'FAILURE', 'owner': owner, 'error': str(e)})
+    else:
+        _set_status(task_id, {'state': 'SUCCESS', 'owner': owner, 'result': result})
+    finally:
+        # The pool threads get their own DB connections; don't leak them
+        connections.close_all()
@@ -93,9 +93,25 @@ DATABASES = {
         'PASSWORD': env.str('DB_PASS'),
         'HOST': env.str('DB_HOST'),
         'PORT': env.str('DB_PORT'),
+        # Reuse connections across requests instead of reconnecting each time
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Background task status is kept here (see core.tasks), so the cache must be
+# shared by all worker processes; a process-local cache fails the core.E001
+# check. The file-based default is shared by the workers of one host, e.g.
+# CACHE_URL=redis://127.0.0.1:6379/1 across hosts.
+
+CACHES = {
+    'default': env.cache_url(
+        'CACHE_URL', default=f"filecache://{BASE_DIR / 'cache'}?max_entries=10000"
+    ),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
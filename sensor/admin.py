@@ -44,7 +44,7 @@ class StationAdminForm(forms.ModelForm):
 
         # if lat/long is provided, override map value
         if lat is not None and lng is not None:
-            cleaned_data["location"] = Point(lng, lat)
+            cleaned_data["location"] = Point(float(lng), float(lat), srid=4326)
 
         return cleaned_data
 
@@ -110,32 +110,23 @@ class SensorAdmin(ReadOnlyUserStampedModelAdmin):
 
                 manufacturer = sensor_details['sensor_type_manufacturer']
                 name = sensor_details['sensor_type_name']
-                core_sensor_type_exists = CoreSensorType.objects.annotate(
+                # One query, served by the Lower(name) index
+                core_sensor_type = CoreSensorType.objects.annotate(
                     name_lower=Lower('name'),
                 ).filter(
-                    name_lower = name.lower(),
-                ).exists()
-
-                if core_sensor_type_exists:
-                    core_sensor_type = CoreSensorType.objects.annotate(
-                        name_lower=Lower('name'),
-                    ).get(
-                        name_lower=name.lower(),
-                    )
+                    name_lower=name.lower(),
+                ).first()
 
                 sensor_type, created = SensorType.objects.get_or_create(
                     manufacturer=manufacturer,
                     name=name
                 )
                 if sensor_type.description is None:
-                    sensor_type.description = core_sensor_type.description if core_sensor_type.description else ''
-                    sensor_type.save()
+                    sensor_type.description = core_sensor_type.description if core_sensor_type and core_sensor_type.description else ''
+                    sensor_type.save(update_fields=['description'])
 
                 sensordatavalues = sensor_details['sensor_value_types']
-                for item in sensordatavalues:
-                    value_type, created = ValueType.objects.get_or_create(name=item)
-                    value_type.value_type = item
-                    value_type.save()
+                ValueType.create_from_codes(sensordatavalues)
 
                 obj.sensor_type = sensor_type
 
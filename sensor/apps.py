@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SensorConfig(AppConfig):
     name = 'sensor'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -4,7 +4,8 @@ from django.db import transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
-from .models import Sensor, SensorDataValue, ValueType
+from .get_sensor_data import GetSensorData
+from .models import Sensor, SensorDataValue, SensorLatestValue, ValueType
 
 API_BASE = "https://data.sensor.community/airrohr/v1/sensor/"
 
@@ -51,27 +52,52 @@ def fetch_and_store_sensor_data(
     log(f"{ts_now('info')} Fetching sensor data...")
 
     if sensors is None:
+        # Only what the fetch loop reads: sensor_id, and the station and
+        # sensor type names for str(sensor) in the log lines
         sensors = Sensor.objects.select_related(
             "station",
             "sensor_type",
-        ).all()
+        ).only(
+            "sensor_id",
+            "station__name",
+            "sensor_type__name",
+        )
 
-    for sensor in sensors:
-        fetch_sensor_data_value(sensor, log, error)
+    # Value types are looked up once for all sensors
+    value_types = get_value_types_by_code()
+
+    # One keep-alive session (and retry policy) for all sensors
+    with GetSensorData.create_session() as session:
+        for sensor in sensors:
+            fetch_sensor_data_value(sensor, log, error, session=session,
+                                    value_types=value_types)
 
     log("✅ Sensor data fetching completed.\n\n")
 
 
-def fetch_sensor_data_value(sensor=None, log=None, error=None):
+def fetch_sensor_data_value(sensor=None, log=None, error=None, session=None,
+                            value_types=None):
+    """
+    Fetch the latest data of one sensor and store new SensorDataValue entries.
+
+    :param session: Optional requests session to reuse connections across calls
+    :param value_types: Optional dict of ValueType objects by value_type code,
+        to share one lookup across sensors
+    """
     api_url = f"{API_BASE}{sensor.sensor_id}/"
     if log:
         log(f"{ts_now('info')} → Fetching for sensor ID: {sensor.sensor_id} ({sensor})")
 
     try:
-        response = requests.get(api_url, timeout=10)
+        response = (session or requests).get(api_url, timeout=10)
         response.raise_for_status()
         data_points = response.json()
 
+        if value_types is None:
+            value_types = get_value_types_by_code()
+
+        # Parse all timestamps first, so existing ones are found in one query
+        entries = []
         for entry in data_points:
             raw_ts = entry.get("timestamp")
             timestamp = parse_datetime(raw_ts)
@@ -90,43 +116,59 @@ def fetch_sensor_data_value(sensor=None, log=None, error=None):
                         )
                     continue
 
-            if SensorDataValue.objects.filter(
-                    sensor=sensor,
-                    timestamp=timestamp,
-            ).exists():
+            entries.append((timestamp, entry))
+
+        existing = set(
+            SensorDataValue.objects.filter(
+                sensor=sensor,
+                timestamp__in=[timestamp for timestamp, _ in entries],
+            ).values_list('timestamp', flat=True)
+        )
+
+        new_values = []
+        for timestamp, entry in entries:
+            if timestamp in existing:
                 if log:
                     log(
                         f"{ts_now('info')} → Data for {sensor.sensor_id} "
                         f"at {timestamp} already exists. Skipping."
                     )
-                    continue
+                continue
 
-            with transaction.atomic():
-                for item in entry.get("sensordatavalues", []):
-                    value_type = item.get("value_type")
-                    value = item.get("value")
+            for item in entry.get("sensordatavalues", []):
+                value_type = item.get("value_type")
+                value = item.get("value")
 
-                    if not value_type or value is None:
-                        continue
+                if not value_type or value is None:
+                    continue
 
-                    try:
-                        measurement = ValueType.objects.get(
-                            value_type=value_type
+                measurement = value_types.get(value_type)
+                if measurement is None:
+                    if error:
+                        error(
+                            f"{ts_now('error')} ❌ ValueType "
+                            f"{value_type} not found. Skipping."
                         )
-                    except ValueType.DoesNotExist:
-                        if error:
-                            error(
-                                f"{ts_now('error')} ❌ ValueType "
-                                f"{value_type} not found. Skipping."
-                            )
-                            continue
-
-                    SensorDataValue.objects.create(
-                        sensor=sensor,
-                        measurement=measurement,
-                        value=value,
-                        timestamp=timestamp,
-                    )
+                    continue
+
+                new_values.append(SensorDataValue(
+                    sensor=sensor,
+                    measurement=measurement,
+                    value=value,
+                    timestamp=timestamp,
+                ))
+
+        # All new values of the sensor in one transaction and a few INSERTs
+        with transaction.atomic():
+            SensorDataValue.objects.bulk_create(
+                new_values, ignore_conflicts=True, batch_size=1000
+            )
+            SensorLatestValue.record(sensor, new_values)
     except Exception as e:
         if error:
             error(f"{ts_now('error')} ⚠️ Error fetching data for {sensor.sensor_id}: {e}")
+
+
+def get_value_types_by_code():
+    """All ValueType objects keyed by their sensor.community value_type code."""
+    return {vt.value_type: vt for vt in ValueType.objects.all()}
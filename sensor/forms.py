@@ -1,52 +1,59 @@
+import functools
+import uuid
+
 from django import forms
 from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 
+from core import tasks
 from core.models import CoreSensorType
-from .fetch_sensor_data_values import fetch_sensor_data_value
 from .models import Station, Sensor, SensorType, ValueType
+from .signals import CORE_SENSOR_TYPE_CHOICES_VERSION_KEY
+from .tasks import fetch_sensor_data_task, fetch_sensors_data_task
 from .utils import get_sensor_details
 
 
+# Shared Tailwind classes of the station (cyan) and sensor (emerald) inputs
+_STATION_INPUT_CLASS = 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none'
+_SENSOR_INPUT_CLASS = 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-emerald-500/50 focus:ring-2 focus:ring-emerald-500/20 transition-all outline-none'
+
+
+def _input_attrs(css_class, **extra):
+    return {'class': css_class, **extra}
+
+
 class StationForm(forms.ModelForm):
     latitude = forms.FloatField(
         required=True,
-        widget=forms.NumberInput(attrs={
-            'step': 'any',
-            'placeholder': '40.7128',
-            'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none'
-        })
+        widget=forms.NumberInput(attrs=_input_attrs(
+            _STATION_INPUT_CLASS, step='any', placeholder='40.7128'
+        ))
     )
     longitude = forms.FloatField(
         required=True,
-        widget=forms.NumberInput(attrs={
-            'step': 'any',
-            'placeholder': '-74.0060',
-            'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none'
-        })
+        widget=forms.NumberInput(attrs=_input_attrs(
+            _STATION_INPUT_CLASS, step='any', placeholder='-74.0060'
+        ))
     )
 
     class Meta:
         model = Station
         fields = ['name', 'sensor_uid','altitude', 'description', 'is_active']
         widgets = {
-            'name': forms.TextInput(attrs={
-                'placeholder': 'e.g., Downtown Air Quality Monitor',
-                'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none'
-            }),
-            'sensor_uid': forms.TextInput(attrs={
-                'placeholder': 'e.g., esp8266-*******',
-                'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none'
-            }),
-            'altitude': forms.NumberInput(attrs={
-                'step': '0.1',
-                'placeholder': 'Optional',
-                'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none'
-            }),
-            'description': forms.Textarea(attrs={
-                'rows': 3,
-                'placeholder': 'Optional description...',
-                'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-cyan-500/50 focus:ring-2 focus:ring-cyan-500/20 transition-all outline-none resize-none'
-            }),
+            'name': forms.TextInput(attrs=_input_attrs(
+                _STATION_INPUT_CLASS, placeholder='e.g., Downtown Air Quality Monitor'
+            )),
+            'sensor_uid': forms.TextInput(attrs=_input_attrs(
+                _STATION_INPUT_CLASS, placeholder='e.g., esp8266-*******'
+            )),
+            'altitude': forms.NumberInput(attrs=_input_attrs(
+                _STATION_INPUT_CLASS, step='0.1', placeholder='Optional'
+            )),
+            'description': forms.Textarea(attrs=_input_attrs(
+                _STATION_INPUT_CLASS + ' resize-none', rows=3, placeholder='Optional description...'
+            )),
             'is_active': forms.CheckboxInput(attrs={
                 'class': 'w-4 h-4 rounded border-gray-600 text-cyan-500 focus:ring-cyan-500/20 bg-dark-800'
             })
@@ -58,24 +65,91 @@ class StationForm(forms.ModelForm):
         lat = cleaned_data.get('latitude')
         lng = cleaned_data.get('longitude')
 
-        if lat is not None and lng is not None:
-            cleaned_data['location'] = Point(lng, lat)
+        # Reject out-of-range coordinates before save() builds the Point
+        if lat is not None and not -90.0 <= lat <= 90.0:
+            self.add_error('latitude', "Latitude must be between -90 and 90.")
+        if lng is not None and not -180.0 <= lng <= 180.0:
+            self.add_error('longitude', "Longitude must be between -180 and 180.")
 
         return cleaned_data
 
     def save(self, commit=True):
+        # sensor_uid etc. are copied by ModelForm; location is built here only
         instance = super().save(commit=False)
-        instance.location = self.cleaned_data.get('location')
-        if self.cleaned_data.get('sensor_uid'):
-            instance.sensor_uid = self.cleaned_data.get('sensor_uid')
+        lat = self.cleaned_data.get('latitude')
+        lng = self.cleaned_data.get('longitude')
+        if lat is not None and lng is not None:
+            instance.location = Point(float(lng), float(lat), srid=4326)
         if commit:
             instance.save()
         return instance
 
 
+# How long the sensor type choices are cached (seconds)
+CORE_SENSOR_TYPE_CHOICES_TIMEOUT = 300
+
+
+def _core_sensor_type_choices():
+    """
+    Choices for the sensor type select, from the Django cache. Saving or
+    deleting a CoreSensorType (also through loaddata) bumps the version in
+    the key (see signals.py); the timeout bounds staleness when the cache
+    isn't shared.
+    """
+    version = cache.get_or_set(CORE_SENSOR_TYPE_CHOICES_VERSION_KEY, uuid.uuid4().hex, None)
+    key = f'core_sensor_type_choices:{version}'
+    choices = cache.get(key)
+    if choices is None:
+        choices = [('', "Select sensor type...")] + [
+            (sensor_type.pk, str(sensor_type))
+            for sensor_type in CoreSensorType.objects.only('id', 'name').order_by('name')
+        ]
+        cache.set(key, choices, CORE_SENSOR_TYPE_CHOICES_TIMEOUT)
+    return choices
+
+
+# How long sensor details from sensor.community are reused (seconds)
+SENSOR_DETAILS_TIMEOUT = 300
+
+
+def _cached_sensor_details(sensor_id):
+    """
+    get_sensor_details() with a short cache, so resubmitting the form for the
+    same sensor doesn't call sensor.community again. Failed lookups are not
+    cached.
+    """
+    key = f'sensor_details:{sensor_id}'
+    details = cache.get(key)
+    if details is None:
+        details = get_sensor_details(sensor_id)
+        if details:
+            cache.set(key, details, SENSOR_DETAILS_TIMEOUT)
+    return details
+
+
+def _upsert_sensor_type(manufacturer, name, description=None):
+    """
+    Get or create the SensorType (manufacturer, name) with one
+    INSERT ... ON CONFLICT DO NOTHING and one SELECT.
+    ``description`` is set on new rows and on existing rows that have none.
+    """
+    SensorType.objects.bulk_create(
+        [SensorType(manufacturer=manufacturer, name=name, description=description)],
+        ignore_conflicts=True,
+    )
+    sensor_type = SensorType.objects.get(manufacturer=manufacturer, name=name)
+
+    if sensor_type.description is None and description is not None:
+        SensorType.objects.filter(pk=sensor_type.pk).update(description=description)
+        sensor_type.description = description
+
+    return sensor_type
+
+
 class SensorForm(forms.ModelForm):
     sensor_type = forms.ModelChoiceField(
-        queryset=CoreSensorType.objects.all(),
+        # Only validates the selected pk; clean() reads its description
+        queryset=CoreSensorType.objects.order_by('name'),
         empty_label="Select sensor type...",
         required=False,
         widget=forms.Select(attrs={
@@ -87,61 +161,88 @@ class SensorForm(forms.ModelForm):
         model = Sensor
         fields = ['sensor_id', 'sensor_type', 'description']
         widgets = {
-            'sensor_id': forms.NumberInput(attrs={
-                'placeholder': 'e.g., 12345 (optional)',
-                'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-emerald-500/50 focus:ring-2 focus:ring-emerald-500/20 transition-all outline-none'
-            }),
-            'description': forms.Textarea(attrs={
-                'rows': 3,
-                'placeholder': 'Optional sensor description...',
-                'class': 'w-full px-4 py-3 rounded-xl bg-dark-800/50 border border-white/10 text-white placeholder-gray-500 focus:border-emerald-500/50 focus:ring-2 focus:ring-emerald-500/20 transition-all outline-none resize-none'
-            })
+            'sensor_id': forms.NumberInput(attrs=_input_attrs(
+                _SENSOR_INPUT_CLASS, placeholder='e.g., 12345 (optional)'
+            )),
+            'description': forms.Textarea(attrs=_input_attrs(
+                _SENSOR_INPUT_CLASS + ' resize-none', rows=3, placeholder='Optional sensor description...'
+            ))
         }
 
     def __init__(self, *args, **kwargs):
+        """
+        ``station`` is the Station the sensor is added to. The form reads its
+        pk, name and altitude only; use for_station_pk() to load it with just
+        those columns.
+        """
         self.station = kwargs.pop('station', None)
         super().__init__(*args, **kwargs)
-        self.fields['sensor_type'].queryset = CoreSensorType.objects.all()
-        self.fields['sensor_type'].empty_label = "Select sensor type..."
+
+        if self.is_bound and not self.data.get(self.add_prefix('sensor_id')):
+            # The form is invalid anyway (see clean_sensor_id); skip validating
+            # the sensor type, which would look it up in the database
+            del self.fields['sensor_type']
+        else:
+            # Rendered from the cached choices; the queryset is only used to validate
+            self.fields['sensor_type'].choices = _core_sensor_type_choices()
+
+    @classmethod
+    def for_station_pk(cls, pk, data=None, **kwargs):
+        """
+        Build the form for the station with the given pk, loading only the
+        station columns the form and the add_sensor view use.
+        Raises Http404 if the station does not exist.
+        """
+        station = get_object_or_404(Station.objects.only('id', 'name', 'altitude'), pk=pk)
+        return cls(data, station=station, **kwargs)
+
+    def clean_sensor_id(self):
+        sensor_id = self.cleaned_data.get('sensor_id')
+        if not sensor_id:
+            raise forms.ValidationError("Either sensor ID or sensor type must be provided.")
+        return sensor_id
 
     def clean(self):
         cleaned_data = super().clean()
         sensor_id = cleaned_data.get('sensor_id')
         form_sensor_type = cleaned_data.get('sensor_type')
         if not sensor_id:
-            raise forms.ValidationError("Either sensor ID or sensor type must be provided.")
-        sensor_details = get_sensor_details(sensor_id)
-        if  sensor_details:
-            station_changed = False
-
-            if not self.station.altitude:
-                self.station.altitude = sensor_details['station_altitude']
-                station_changed = True
-
-            if station_changed:
-                self.station.save()
-
-
-            manufacturer = sensor_details['sensor_type_manufacturer']
-            name = sensor_details['sensor_type_name']
-
-            sensor_type, created = SensorType.objects.get_or_create(
-                manufacturer=manufacturer,
-                name=name
+            return cleaned_data
+        sensor_details = _cached_sensor_details(sensor_id)
+        if not sensor_details and not form_sensor_type:
+            raise forms.ValidationError(
+                "Sensor details could not be found; please select a sensor type."
             )
+        if sensor_details:
+            # One transaction for the station, sensor type and value type
+            # writes, with the station row locked against concurrent submits
+            with transaction.atomic():
+                altitude = Station.objects.select_for_update().values_list(
+                    'altitude', flat=True
+                ).get(pk=self.station.pk)
+                if not altitude:
+                    # Targeted UPDATE of the one column instead of a full save()
+                    altitude = sensor_details['station_altitude']
+                    Station.objects.filter(pk=self.station.pk).update(altitude=altitude)
+                self.station.altitude = altitude
 
-            if sensor_type.description is None:
-                sensor_type.description = form_sensor_type.description if form_sensor_type and form_sensor_type.description else ''
-                sensor_type.save()
+                manufacturer = sensor_details['sensor_type_manufacturer']
+                name = sensor_details['sensor_type_name']
 
-            sensordatavalues = sensor_details['sensor_value_types']
-            for item in sensordatavalues:
-                value_type, created = ValueType.objects.get_or_create(name=item)
-                value_type.value_type = item
-                value_type.save()
+                sensor_type = _upsert_sensor_type(
+                    manufacturer,
+                    name,
+                    form_sensor_type.description if form_sensor_type and form_sensor_type.description else ''
+                )
+
+                sensordatavalues = sensor_details['sensor_value_types']
+                ValueType.create_from_codes(sensordatavalues)
         else:
-            sensor_type, created = SensorType.objects.get_or_create(
-                name=form_sensor_type.name,
+            # An existing sensor type of that name (any manufacturer) is
+            # reused rather than adding one without manufacturer next to it
+            sensor_type = (
+                SensorType.objects.filter(name=form_sensor_type.name).order_by('pk').first()
+                or _upsert_sensor_type('', form_sensor_type.name)
             )
 
         cleaned_data['sensor_type'] = sensor_type
@@ -154,5 +255,35 @@ class SensorForm(forms.ModelForm):
         if commit:
             instance.sensor_type = self.cleaned_data['sensor_type']
             instance.save()
-        fetch_sensor_data_value(instance)
-        return instance
\ No newline at end of file
+            # Fetch the first data in the background instead of during the
+            # POST, once the sensor is committed and visible to the worker
+            transaction.on_commit(functools.partial(tasks.defer, fetch_sensor_data_task, instance.pk))
+        return instance
+
+    @classmethod
+    def bulk_save(cls, forms_iter):
+        """
+        Save the sensors of several valid SensorForms with one INSERT and
+        fetch their first data in a single background task, for batch
+        imports that would otherwise call save() once per sensor.
+        The sensor and value types were already created by each form's clean().
+
+        Returns:
+            List of the created Sensor instances
+        """
+        instances = []
+        for form in forms_iter:
+            instance = form.save(commit=False)
+            instance.sensor_type = form.cleaned_data['sensor_type']
+            instance.set_sensor_family()
+            instances.append(instance)
+
+        # PostgreSQL returns the new primary keys from bulk_create
+        sensors = Sensor.objects.bulk_create(instances)
+        if sensors:
+            # bulk_create sends no post_save signals
+            Station.update_sensor_counts({sensor.station_id for sensor in sensors})
+            transaction.on_commit(functools.partial(
+                tasks.defer, fetch_sensors_data_task, [sensor.pk for sensor in sensors]
+            ))
+        return sensors
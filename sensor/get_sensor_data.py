@@ -1,31 +1,293 @@
+import calendar
+import csv
+import importlib.util
+import json
+import logging
+import multiprocessing
+from contextlib import nullcontext
+import os
 from pathlib import Path
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import requests
 from typing import Optional, List, Dict
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from requests.adapters import HTTPAdapter
+import urllib3
 from urllib3.util.retry import Retry
 
+logger = logging.getLogger(__name__)
+
+# Bytes read from the response and written to disk per copy step
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+
+# PyArrow is optional; when installed, CSVs are parsed with its
+# multithreaded C++ reader
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Months merged at the same time while the remaining days download
+MERGE_WORKERS = 2
+
+# Types of the columns shared by the archive files, so pandas doesn't infer
+# them per file. Other (sensor specific) columns are still inferred; text
+# columns stay strings so merged files keep their original values.
+_READ_DTYPES = {
+    'sensor_id': 'str',
+    'sensor_type': 'str',
+    'location': 'str',
+    'lat': 'float64',
+    'lon': 'float64',
+    'timestamp': 'str',
+    'P1': 'float64',
+    'durP1': 'float64',
+    'ratioP1': 'float64',
+    'P2': 'float64',
+    'durP2': 'float64',
+    'ratioP2': 'float64',
+}
+
+# File formats of the monthly and yearly merged files
+MERGED_FORMATS = ('csv', 'parquet')
+
+# Archive URLs that returned 404 are not requested again for this long (seconds),
+# except for recent dates whose files may still be published
+MISSING_URL_TTL = 7 * 24 * 60 * 60
+MISSING_URL_RECENT_DAYS = 2
+
+# Sensor metadata from the API is reused for this long (seconds)
+METADATA_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Serializes writes of the cache files within the process
+_cache_file_lock = threading.Lock()
+
+# Columns and zero measurements of the placeholder file written for a missing day
+PLACEHOLDER_HEADER = ('sensor_id', 'sensor_type', 'location', 'lat', 'lon', 'timestamp',
+                      'P1', 'durP1', 'ratioP1', 'P2', 'durP2', 'ratioP2')
+PLACEHOLDER_VALUES = ('0.0',) * 6
+# Placeholder files are far smaller than this; larger files are never checked
+PLACEHOLDER_MAX_SIZE = 1024
+
+# Sensor CSV links (file name and sensor id) in an archive.sensor.community day index page
+_INDEX_FILE_RE = re.compile(r'href="([^"/]+_sensor_(\d+)\.csv)"')
+
+# Day indexes of past dates, shared by all GetSensorData instances of the
+# process ({(base_url, date): {sensor_id: [file names]}}); at most
+# DATE_INDEX_CACHE_SIZE dates are kept, least recently used dropped first
+DATE_INDEX_CACHE_SIZE = 31
+_date_index_cache = OrderedDict()
+_date_index_lock = threading.Lock()
+
+
+def _read_sensor_csv(csv_file: Path) -> pd.DataFrame:
+    """Read a ';'-separated sensor CSV, with the PyArrow parser if available."""
+    if _HAS_PYARROW:
+        return _read_sensor_csv_pyarrow(csv_file)
+    return pd.read_csv(csv_file, sep=';', dtype=_READ_DTYPES, low_memory=False)
+
+
+def _read_sensor_csv_pyarrow(csv_file: Path) -> pd.DataFrame:
+    """
+    Read a sensor CSV with pyarrow.csv directly. Through pandas' pyarrow
+    engine the dtypes are only applied after parsing, so the ISO timestamps
+    would come back as datetimes and be rewritten without the 'T'.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    column_types = {
+        column: pa.string() if dtype == 'str' else pa.float64()
+        for column, dtype in _READ_DTYPES.items()
+    }
+    table = pa_csv.read_csv(
+        csv_file,
+        parse_options=pa_csv.ParseOptions(delimiter=';'),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types),
+    )
+    return table.to_pandas()
+
+
+def _is_placeholder_file(path: Path) -> bool:
+    """
+    True if ``path`` is a placeholder written by _create_placeholder_file()
+    (the header and a single midnight row of zero measurements).
+    """
+    try:
+        if path.stat().st_size > PLACEHOLDER_MAX_SIZE:
+            return False
+        with open(path, encoding='utf-8', newline='') as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return False
+
+    return (len(lines) == 2
+            and lines[0] == ';'.join(PLACEHOLDER_HEADER)
+            and lines[1].endswith(' 00:00:00;' + ';'.join(PLACEHOLDER_VALUES)))
+
+
+def _read_json(path: Path) -> dict:
+    """Load a JSON cache file, or {} if it is missing or unreadable."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: Path, data: dict):
+    """Replace a JSON cache file atomically."""
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp',
+                                     delete=False, encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(f.name, path)
+
+
+def _read_merged_file(path: Path) -> pd.DataFrame:
+    """Read a monthly merged file, written as CSV or Parquet."""
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return _read_sensor_csv(path)
+
+
+def _write_merged_file(df: pd.DataFrame, path: Path):
+    """Write a merged file in the format given by its suffix."""
+    if path.suffix == '.parquet':
+        df.to_parquet(path, compression='snappy', index=False)
+        return
+
+    # pandas quotes only values that need it, so merged files keep the
+    # unquoted format (and header) of the daily files
+    df.to_csv(path, sep=';', index=False)
+
+
+def _sort_and_dedupe(merged_df: pd.DataFrame, dedupe: bool) -> pd.DataFrame:
+    """
+    Sort merged rows by timestamp and, if ``dedupe``, drop rows repeating the
+    timestamp of the same sensor. Archive files don't overlap, so the
+    dedupe is only needed for hand-edited or re-downloaded data.
+    """
+    if 'timestamp' not in merged_df.columns:
+        return merged_df
+
+    # Sorted on the parsed timestamps (native int64 sort) while the column
+    # keeps its original strings; ignore_index renumbers the rows in the
+    # same pass (no reset_index copy)
+    merged_df = merged_df.sort_values(
+        'timestamp', kind='stable', ignore_index=True,
+        key=lambda col: pd.to_datetime(col, format='ISO8601', errors='coerce')
+    )
+
+    if dedupe:
+        # Hash the key columns only, not every measurement column
+        subset = [c for c in ('sensor_id', 'sensor_type', 'timestamp') if c in merged_df.columns]
+        initial_rows = len(merged_df)
+        merged_df = merged_df.drop_duplicates(subset=subset, keep='first', ignore_index=True)
+        final_rows = len(merged_df)
+
+        if initial_rows != final_rows:
+            logger.info("Removed %d duplicate rows", initial_rows - final_rows)
+
+    return merged_df
+
+
+def _merge_mp_context():
+    """
+    Start method of the merge processes: never fork, since forking a process
+    with busy download threads (and held logging/DB locks) can deadlock the
+    children. forkserver where available, spawn otherwise (e.g. Windows).
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _merge_year_files(year: str, year_files: List[Path], yearly_path: Path,
+                      dedupe: bool = False):
+    """
+    Merge one year's monthly files into a yearly file.
+
+    Kept at module level so it can run in a ProcessPoolExecutor: the pandas
+    parse, sort and dedup are CPU-bound and would hold the GIL in a thread.
+    """
+    logger.info("Merging %d monthly files for year %s", len(year_files), year)
+
+    # Read all monthly files
+    dataframes = []
+    for csv_file in sorted(year_files):
+        try:
+            df = _read_merged_file(csv_file)
+            dataframes.append(df)
+            logger.debug("%s: %d rows", csv_file.name, len(df))
+        except Exception as e:
+            logger.warning("Error reading %s: %s", csv_file.name, e)
+
+    if not dataframes:
+        logger.warning("No valid CSV files to merge for year %s", year)
+        return
+
+    # Concatenate
+    merged_df = pd.concat(dataframes, ignore_index=True)
+
+    merged_df = _sort_and_dedupe(merged_df, dedupe)
+
+    # Save
+    _write_merged_file(merged_df, yearly_path)
+    logger.info("Yearly merged file created: %s (%d rows)", yearly_path, len(merged_df))
+
 
 class GetSensorData:
 
-    def __init__(self, output_dir='sensor_data', max_workers=10):
+    def __init__(self, output_dir='sensor_data', max_workers=10, semaphore=None, session=None,
+                 use_fast_merge=True, manifest=None, merged_format='csv', dedupe=False):
         self.base_url = 'https://archive.sensor.community/'
         self.api_url = 'https://data.sensor.community/airrohr/v1/sensor/'
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
 
         # Enhanced session with connection pooling and retry logic
-        self.session = self._create_session()
-
-        # Thread-local storage for thread-safe operations
-        self._local = threading.local()
+        # (an existing session can be shared between downloaders)
+        # One connection per worker, with room for the metadata requests
+        self.session = session if session is not None else self.create_session(
+            pool_maxsize=max(max_workers, 32)
+        )
 
         # Concurrent download settings
         self.max_workers = max_workers  # Number of parallel downloads
 
+        # Optional semaphore shared between downloaders to cap total in-flight dates
+        self._semaphore = semaphore if semaphore is not None else nullcontext()
+
+        # Merge monthly files by byte concatenation when their headers match
+        self.use_fast_merge = use_fast_merge
+
+        # Merged files are CSV by default, which the station data browser
+        # shows; 'parquet' writes snappy-compressed Parquet instead
+        if merged_format not in MERGED_FORMATS:
+            raise ValueError(f"merged_format must be one of {MERGED_FORMATS}")
+        self.merged_format = merged_format
+
+        # Drop rows repeating a sensor's timestamp when merging with pandas
+        self.dedupe = dedupe
+
+        # Completed months ({"<sensor_id>/<YYYY-MM>": {"files": {name: size}}});
+        # months listed here with intact files are not requested again
+        self.manifest = manifest if manifest is not None else {}
+        self.completed_months = {}
+
+        # Guards the merge manifests written by concurrent monthly merges
+        self._merge_manifest_lock = threading.Lock()
+
+        # Archive URLs that returned 404 ({url: unix time}), kept across runs
+        self._url_cache_path = self.output_dir / '.url_cache.json'
+        self._missing_urls = self._load_url_cache()
+
+        # Sensor metadata fetched from the API ({sensor_id: {..., 'fetched_at': unix time}})
+        self._metadata_cache_path = self.output_dir / '.metadata_cache.json'
+
         # Default date range
         self.start_date = '2025-08-15'
         self.end_date = datetime.today().strftime('%Y-%m-%d')
@@ -39,8 +301,19 @@ class GetSensorData:
             'lon': '0.0'
         }
 
-    def _create_session(self):
-        """Create a session with connection pooling and retry strategy."""
+    @staticmethod
+    def create_session(pool_maxsize: int = 20) -> requests.Session:
+        """
+        Create a session with connection pooling and retry strategy.
+
+        All requests go to the two sensor.community hosts, so only a few
+        pools are needed, each large enough for every worker. Requests wait
+        for a free connection instead of opening (and then discarding) extra
+        ones when a pool is exhausted.
+
+        Args:
+            pool_maxsize: Max connections kept open per host
+        """
         session = requests.Session()
 
         # Retry strategy for failed requests
@@ -54,9 +327,9 @@ class GetSensorData:
         # HTTP adapter with connection pooling
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
-            pool_connections=20,  # Number of connection pools
-            pool_maxsize=20,  # Max connections per pool
-            pool_block=False
+            pool_connections=4,  # Number of connection pools (one per host)
+            pool_maxsize=pool_maxsize,  # Max connections per pool
+            pool_block=True
         )
 
         session.mount("http://", adapter)
@@ -65,12 +338,6 @@ class GetSensorData:
 
         return session
 
-    def _get_thread_session(self):
-        """Get or create a session for the current thread."""
-        if not hasattr(self._local, 'session'):
-            self._local.session = self._create_session()
-        return self._local.session
-
     def fetch_sensor_metadata(self, sensor_id: str, sensor_type: str = 'sds011') -> bool:
         """
         Automatically fetch sensor metadata (location, lat, lon) from sensor.community API.
@@ -82,6 +349,16 @@ class GetSensorData:
         Returns:
             True if metadata was successfully fetched, False otherwise
         """
+        # Reuse metadata fetched by a recent run
+        cached = _read_json(self._metadata_cache_path).get(str(sensor_id))
+        if (cached and cached.get('sensor_type') == sensor_type
+                and time.time() - cached['fetched_at'] < METADATA_CACHE_TTL):
+            self.sensor_metadata = {
+                key: cached[key] for key in ('sensor_id', 'sensor_type', 'location', 'lat', 'lon')
+            }
+            logger.debug("Using cached metadata for sensor %s", sensor_id)
+            return True
+
         try:
             url = f"{self.api_url}{sensor_id}/"
             response = self.session.get(url, timeout=10)
@@ -90,7 +367,7 @@ class GetSensorData:
             data = response.json()
 
             if not data or len(data) == 0:
-                print(f" No data returned from API for sensor {sensor_id}")
+                logger.warning("No data returned from API for sensor %s", sensor_id)
                 return False
 
             # Get location info from the first data point
@@ -119,15 +396,17 @@ class GetSensorData:
                 'lon': str(longitude)
             }
 
-            print(f" Metadata fetched successfully!")
-            print(f" Location: {location_name}")
-            print(f" Coordinates: {latitude}, {longitude}")
+            logger.info("Metadata fetched for sensor %s: %s (%s, %s)", sensor_id, location_name, latitude, longitude)
+
+            with _cache_file_lock:
+                metadata_cache = _read_json(self._metadata_cache_path)
+                metadata_cache[str(sensor_id)] = {**self.sensor_metadata, 'fetched_at': time.time()}
+                _write_json(self._metadata_cache_path, metadata_cache)
 
             return True
 
         except requests.RequestException as e:
-            print(f"Error fetching metadata: {e}")
-            print(f"   Using default values instead")
+            logger.warning("Error fetching metadata for sensor %s, using default values: %s", sensor_id, e)
             self.sensor_metadata = {
                 'sensor_id': sensor_id,
                 'sensor_type': sensor_type,
@@ -137,7 +416,7 @@ class GetSensorData:
             }
             return False
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            logger.exception("Unexpected error fetching metadata for sensor %s", sensor_id)
             return False
 
     def set_sensor_metadata(self, sensor_id: str, sensor_type: str,
@@ -159,7 +438,7 @@ class GetSensorData:
             'lat': lat,
             'lon': lon
         }
-        print(f"📍 Sensor metadata set manually for: {sensor_id} ({sensor_type})")
+        logger.debug("Sensor metadata set manually for: %s (%s)", sensor_id, sensor_type)
 
     def _create_placeholder_file(self, date_str: str, sensor_type: str,
                                  month_folder: Path) -> Optional[Path]:
@@ -181,30 +460,27 @@ class GetSensorData:
             if file_path.exists():
                 return file_path
 
-            print(f" Creating placeholder file: {filename}")
-
-            df = pd.DataFrame({
-                'sensor_id': [self.sensor_metadata['sensor_id']],
-                'sensor_type': [sensor_type],
-                'location': [self.sensor_metadata['location']],
-                'lat': [self.sensor_metadata['lat']],
-                'lon': [self.sensor_metadata['lon']],
-                'timestamp': [date_str + ' 00:00:00'],
-                'P1': [0.0],
-                'durP1': [0.0],
-                'ratioP1': [0.0],
-                'P2': [0.0],
-                'durP2': [0.0],
-                'ratioP2': [0.0]
-            })
-
-            df.to_csv(file_path, sep=';', index=False)
-            print(f"Placeholder file created")
+            logger.debug("Creating placeholder file: %s", filename)
+
+            # Written with the csv module: same output as a one-row DataFrame
+            # to_csv, without the pandas overhead
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, delimiter=';', lineterminator='\n')
+                writer.writerow(PLACEHOLDER_HEADER)
+                writer.writerow([
+                    self.sensor_metadata['sensor_id'],
+                    sensor_type,
+                    self.sensor_metadata['location'],
+                    self.sensor_metadata['lat'],
+                    self.sensor_metadata['lon'],
+                    date_str + ' 00:00:00',
+                    *PLACEHOLDER_VALUES,
+                ])
 
             return file_path
 
         except Exception as e:
-            print(f"   Error creating placeholder file: {e}")
+            logger.warning("Error creating placeholder file for %s: %s", date_str, e)
             return None
 
     def _download_single_date(self, date_info: Dict) -> Dict:
@@ -223,8 +499,8 @@ class GetSensorData:
         month_folder = date_info['month_folder']
         create_missing = date_info['create_missing']
 
-        # Use thread-local session for thread safety
-        session = self._get_thread_session()
+        # One pooled session is shared by all worker threads (keep-alive reuse)
+        session = self.session
 
         result = {
             'date': date_str,
@@ -232,28 +508,33 @@ class GetSensorData:
             'created_placeholder': False
         }
 
-        files = self._get_files_for_date_concurrent(sensor_id, date_str, sensor_type, session)
+        with self._semaphore:
+            # One GET per candidate URL; a 404 means there is no file that day
+            # Dates already run in parallel in the outer pool, so a date's
+            # candidates are fetched one after another
+            for file_url in self._get_files_for_date_concurrent(sensor_id, date_str, sensor_type, session):
+                file_path = self._download_file_concurrent(file_url, month_folder, session)
+                if file_path:
+                    result['files'].append(str(file_path))
 
-        if not files:
-            if create_missing and sensor_type:
+            if not result['files'] and create_missing and sensor_type:
                 placeholder_file = self._create_placeholder_file(
                     date_str, sensor_type, month_folder
                 )
                 if placeholder_file:
                     result['files'].append(str(placeholder_file))
                     result['created_placeholder'] = True
-        else:
-            for file_url in files:
-                file_path = self._download_file_concurrent(file_url, month_folder, session)
-                if file_path:
-                    result['files'].append(str(file_path))
 
         return result
 
     def _get_files_for_date_concurrent(self, sensor_id: str, date: str,
                                        sensor_type: Optional[str], session) -> List[str]:
         """
-        Get list of files available for a specific date (thread-safe version).
+        Get the candidate file URLs for a specific date.
+
+        With a sensor type the URL is not checked; _download_file_concurrent()
+        returns None if it doesn't exist. Without one, the files of the sensor
+        are looked up in the day's archive index.
 
         Args:
             sensor_id: Sensor ID
@@ -265,50 +546,55 @@ class GetSensorData:
             List of file URLs
         """
         date_url = f"{self.base_url}{date}/"
-        files = []
 
-        if sensor_type:
-            file_url = f"{date_url}{date}_{sensor_type}_sensor_{sensor_id}.csv"
-            if self._check_file_exists_concurrent(file_url, session):
-                files.append(file_url)
-        else:
-            # Try common sensor types in parallel
-            common_types = ['sds011', 'dht22', 'bmp180']
-
-            # Check all types quickly with HEAD requests
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                future_to_type = {
-                    executor.submit(
-                        self._check_file_exists_concurrent,
-                        f"{date_url}{date}_{s_type}_sensor_{sensor_id}.csv",
-                        session
-                    ): s_type for s_type in common_types
-                }
+        if not sensor_type:
+            files_by_sensor = self._list_date_index(date, session)
+            if files_by_sensor is not None:
+                return [f"{date_url}{name}" for name in files_by_sensor.get(str(sensor_id), ())]
 
-                for future in as_completed(future_to_type):
-                    s_type = future_to_type[future]
-                    if future.result():
-                        file_url = f"{date_url}{date}_{s_type}_sensor_{sensor_id}.csv"
-                        files.append(file_url)
+        # Without a sensor type and index, try the common ones
+        sensor_types = [sensor_type] if sensor_type else ['sds011', 'dht22', 'bmp180']
 
-        return files
+        return [
+            f"{date_url}{date}_{s_type}_sensor_{sensor_id}.csv"
+            for s_type in sensor_types
+        ]
 
-    def _check_file_exists_concurrent(self, url: str, session) -> bool:
+    def _list_date_index(self, date: str, session) -> Optional[Dict[str, List[str]]]:
         """
-        Check if a file exists at the given URL (thread-safe version).
+        Get the sensor CSV file names listed in the archive index of a date.
 
-        Args:
-            url: URL to check
-            session: Requests session to use
+        Indexes of past dates are kept in a process-wide LRU cache, so all
+        sensors (and GetSensorData instances) share one request per date.
 
         Returns:
-            True if file exists, False otherwise
+            Dictionary of sensor id to file names, or None if the index could
+            not be fetched
         """
+        key = (self.base_url, date)
+        with _date_index_lock:
+            files_by_sensor = _date_index_cache.get(key)
+            if files_by_sensor is not None:
+                _date_index_cache.move_to_end(key)
+                return files_by_sensor
+
         try:
-            response = session.head(url, timeout=5)
-            return response.status_code == 200
+            response = session.get(f"{self.base_url}{date}/", timeout=30)
+            response.raise_for_status()
         except requests.RequestException:
-            return False
+            return None
+
+        files_by_sensor = {}
+        for name, file_sensor_id in _INDEX_FILE_RE.findall(response.text):
+            files_by_sensor.setdefault(file_sensor_id, []).append(name)
+
+        # Today's index is still growing
+        if date < datetime.today().strftime('%Y-%m-%d'):
+            with _date_index_lock:
+                _date_index_cache[key] = files_by_sensor
+                if len(_date_index_cache) > DATE_INDEX_CACHE_SIZE:
+                    _date_index_cache.popitem(last=False)
+        return files_by_sensor
 
     def _download_file_concurrent(self, url: str, output_folder: Path, session) -> Optional[Path]:
         """
@@ -320,29 +606,70 @@ class GetSensorData:
             session: Requests session to use
 
         Returns:
-            Path to downloaded file or None if failed
+            Path to downloaded file or None if it doesn't exist or failed
         """
         try:
             filename = url.split('/')[-1]
             file_path = output_folder / filename
 
-            # Skip if already downloaded
-            if file_path.exists():
+            # Skip if already downloaded; a placeholder from an earlier run is
+            # downloaded again (and kept if the file is still missing)
+            if file_path.exists() and not _is_placeholder_file(file_path):
                 return file_path
 
-            response = session.get(url, timeout=30, stream=True)
-            response.raise_for_status()
-
-            # Write file
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Skip if known to be missing
+            checked = self._missing_urls.get(url)
+            if checked is not None and time.time() - checked < MISSING_URL_TTL:
+                return None
+
+            with session.get(url, timeout=30, stream=True) as response:
+                if response.status_code == 404:
+                    self._remember_missing_url(url, filename[:10])
+                    return None
+                response.raise_for_status()
+
+                # Copy the raw stream in C; decode_content undoes any gzip
+                # transfer encoding. Written under a temporary name so an
+                # interrupted download isn't mistaken for a complete file.
+                response.raw.decode_content = True
+                tmp_path = file_path.with_name(file_path.name + '.tmp')
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                os.replace(tmp_path, file_path)
 
             return file_path
 
-        except requests.RequestException:
+        except (requests.RequestException, urllib3.exceptions.HTTPError):
             return None
 
+    def _load_url_cache(self) -> Dict[str, float]:
+        """Load the still valid entries of the missing-URL cache."""
+        cached = _read_json(self._url_cache_path)
+        now = time.time()
+        return {url: checked for url, checked in cached.items() if now - checked < MISSING_URL_TTL}
+
+    def _remember_missing_url(self, url: str, date_str: str):
+        """Record a 404, unless the date is too recent for the archive to be final."""
+        recent = (datetime.today() - timedelta(days=MISSING_URL_RECENT_DAYS)).strftime('%Y-%m-%d')
+        if date_str >= recent:
+            return
+        self._missing_urls[url] = time.time()
+
+    def save_url_cache(self):
+        """
+        Write the missing-URL cache, merged with entries other instances using
+        the same output folder have written meanwhile.
+        """
+        with _cache_file_lock:
+            cached = self._load_url_cache()
+            cached.update(self._missing_urls)
+            self._missing_urls = cached
+            _write_json(self._url_cache_path, cached)
+
     def download_from_date(self, sensor_id: str, sensor_type: Optional[str] = None,
                            list_only: bool = False, merge: bool = True,
                            create_missing: bool = True,
@@ -381,44 +708,60 @@ class GetSensorData:
         # Dictionary to track files by month
         monthly_files = {}
 
+        # Months already complete on disk according to the manifest
+        skipped_months = set()
+
         # Parse date range
         start = datetime.strptime(self.start_date, '%Y-%m-%d')
         end = datetime.strptime(self.end_date, '%Y-%m-%d')
 
-        # Build list of all dates to process
+        # Build list of all dates to process; all date strings are formatted
+        # in one vectorized call and the month is their 'YYYY-MM' prefix
         dates_to_process = []
-        current_date = start
-        while current_date <= end:
-            date_str = current_date.strftime('%Y-%m-%d')
-            month_str = current_date.strftime('%Y-%m')
-            month_folder = sensor_folder / month_str
-            month_folder.mkdir(exist_ok=True, parents=True)
+        month_folders = {}
+        for date_str in pd.date_range(start, end, freq='D').strftime('%Y-%m-%d'):
+            month_str = date_str[:7]
 
             if month_str not in monthly_files:
-                monthly_files[month_str] = []
+                month_folder = month_folders[month_str] = sensor_folder / month_str
+                month_folder.mkdir(exist_ok=True, parents=True)
+                cached_files = self._manifest_month_files(sensor_id, month_str, month_folder)
+                if cached_files is not None:
+                    skipped_months.add(month_str)
+                monthly_files[month_str] = cached_files or []
+
+            if month_str in skipped_months:
+                continue
 
             dates_to_process.append({
                 'date_str': date_str,
                 'month_str': month_str,
-                'month_folder': month_folder,
+                'month_folder': month_folders[month_str],
                 'sensor_id': sensor_id,
                 'sensor_type': sensor_type,
                 'create_missing': create_missing
             })
 
-            current_date += timedelta(days=1)
-
         # Download files in parallel
-        print(f"\n{'=' * 70}")
-        print(f"DOWNLOADING DATA FOR SENSOR: {sensor_id}")
-        print(f"{'=' * 70}")
-        print(f"Date range: {self.start_date} to {self.end_date}")
-        print(f"Total days: {len(dates_to_process)}")
-        print(f"Parallel workers: {self.max_workers}")
-        print(f"{'=' * 70}\n")
+        logger.info("Downloading data for sensor %s: %s to %s, %d days, %d parallel workers",
+                    sensor_id, self.start_date, self.end_date, len(dates_to_process), self.max_workers)
+        if skipped_months:
+            logger.info("Skipped complete months: %s", ', '.join(sorted(skipped_months)))
+
+        # Days per month with real (non-placeholder) downloaded files
+        days_with_files = {}
+
+        # Months merged while the other months were still downloading
+        merged_months = set()
 
         if not list_only:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Days still to download per month; a month is merged once it reaches 0
+            pending_days = {}
+            for date_info in dates_to_process:
+                pending_days[date_info['month_str']] = pending_days.get(date_info['month_str'], 0) + 1
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                    ThreadPoolExecutor(max_workers=MERGE_WORKERS) as merge_executor:
                 # Submit all download tasks
                 future_to_date = {
                     executor.submit(self._download_single_date, date_info): date_info
@@ -428,47 +771,113 @@ class GetSensorData:
                 # Process completed downloads
                 completed = 0
                 for future in as_completed(future_to_date):
-                    date_info = future_to_date[future]
+                    # Drop finished futures so their results can be freed
+                    # while the rest of a long range is still downloading
+                    date_info = future_to_date.pop(future)
                     result = future.result()
 
                     month_str = date_info['month_str']
                     monthly_files[month_str].extend(result['files'])
+                    if result['files'] and not result['created_placeholder']:
+                        days_with_files[month_str] = days_with_files.get(month_str, 0) + 1
+
+                    pending_days[month_str] -= 1
+                    if merge and pending_days[month_str] == 0 and monthly_files[month_str]:
+                        merge_executor.submit(self._merge_csv_files, sensor_folder / month_str,
+                                              sensor_id, sensor_type)
+                        merged_months.add(month_str)
 
                     completed += 1
                     if completed % 10 == 0 or completed == len(dates_to_process):
-                        print(f"Progress: {completed}/{len(dates_to_process)} days processed")
+                        logger.info("Progress: %d/%d days processed", completed, len(dates_to_process))
+
+            self._record_completed_months(sensor_id, sensor_folder, monthly_files,
+                                          days_with_files, start, end)
+            self.save_url_cache()
 
         # Print summary
         total_files = sum(len(files) for files in monthly_files.values())
-        print(f"\n{'=' * 70}")
-        print(f"Total files downloaded: {total_files}")
+        logger.info("Total files downloaded for sensor %s: %d", sensor_id, total_files)
         for month, files in monthly_files.items():
-            print(f"  {month}: {len(files)} files")
-        print(f"{'=' * 70}\n")
+            logger.debug("%s: %d files", month, len(files))
 
         # Merge files for each month if requested
         if merge and not list_only and total_files > 0:
-            print("Merging monthly files...")
+            logger.info("Merging monthly files...")
             for month, files in monthly_files.items():
-                if files:
+                if files and month not in merged_months:
                     self._merge_csv_files(sensor_folder / month, sensor_id, sensor_type)
 
         # Merge by year if requested
         if merge_by_year and not list_only and total_files > 0:
-            print("Merging yearly files...")
+            logger.info("Merging yearly files...")
             self.merge_months_by_year(sensor_folder, sensor_id, sensor_type)
 
         return monthly_files
 
+    def _manifest_month_files(self, sensor_id: str, month_str: str,
+                              month_folder: Path) -> Optional[List[str]]:
+        """
+        Return the files of a month recorded as complete in the manifest.
+
+        Returns:
+            List of file paths, or None if the month is not in the manifest or
+            any of its files is missing or has changed size
+        """
+        entry = self.manifest.get(f"{sensor_id}/{month_str}")
+        if not entry:
+            return None
+
+        files = []
+        for name, size in entry['files'].items():
+            file_path = month_folder / name
+            try:
+                if file_path.stat().st_size != size:
+                    return None
+            except OSError:
+                return None
+            # Months recorded with placeholder days by older versions are retried
+            if size <= PLACEHOLDER_MAX_SIZE and _is_placeholder_file(file_path):
+                return None
+            files.append(str(file_path))
+        return files
+
+    def _record_completed_months(self, sensor_id: str, sensor_folder: Path,
+                                 monthly_files: Dict[str, List[str]],
+                                 days_with_files: Dict[str, int],
+                                 start: datetime, end: datetime):
+        """
+        Add months that are fully in the past, fully inside the requested range
+        and have a downloaded file for every day to the manifest and
+        completed_months. Months with placeholder days are retried next run.
+        """
+        today = datetime.today()
+        for month_str, n_days in days_with_files.items():
+            year, month = map(int, month_str.split('-'))
+            days_in_month = calendar.monthrange(year, month)[1]
+            first_day = datetime(year, month, 1)
+            last_day = datetime(year, month, days_in_month)
+
+            if (n_days != days_in_month or first_day < start
+                    or last_day > end or last_day.date() >= today.date()):
+                continue
+
+            month_folder = sensor_folder / month_str
+            entry = {
+                'files': {
+                    Path(f).name: (month_folder / Path(f).name).stat().st_size
+                    for f in monthly_files[month_str]
+                }
+            }
+            key = f"{sensor_id}/{month_str}"
+            self.manifest[key] = entry
+            self.completed_months[key] = entry
+
     def _get_files_for_date(self, sensor_id: str, date: str,
                             sensor_type: Optional[str] = None) -> List[str]:
         """Legacy method for compatibility."""
         return self._get_files_for_date_concurrent(sensor_id, date, sensor_type, self.session)
 
-    def _check_file_exists(self, url: str) -> bool:
-        """Legacy method for compatibility."""
-        return self._check_file_exists_concurrent(url, self.session)
-
     def _download_file(self, url: str, output_folder: Path) -> Optional[Path]:
         """Legacy method for compatibility."""
         return self._download_file_concurrent(url, output_folder, self.session)
@@ -480,15 +889,11 @@ class GetSensorData:
         OPTIMIZED: Uses chunked reading for large files.
         """
         try:
-            if sensor_type:
-                csv_files = sorted([f for f in month_folder.glob(f'*_{sensor_type}_sensor_{sensor_id}.csv')
-                                    if not (f.name.startswith('merged_') or f.name.startswith('FULL_'))])
-            else:
-                csv_files = sorted([f for f in month_folder.glob('*.csv')
-                                    if not (f.name.startswith('merged_') or f.name.startswith('FULL_'))])
+            suffix = f'_{sensor_type}_sensor_{sensor_id}.csv' if sensor_type else '.csv'
+            csv_files = self._scan_files(month_folder, suffix, exclude_prefixes=('merged_', 'FULL_'))
 
             if not csv_files:
-                print(f"⚠️  No CSV files found in {month_folder.name}")
+                logger.warning("No CSV files found in %s", month_folder.name)
                 return
 
             sensor_folder = month_folder.parent
@@ -498,51 +903,196 @@ class GetSensorData:
 
             month_name = month_folder.name
             year, month_num = month_name.split('-')
-            merged_filename = f"{year}_{month_num}_{sensor_id}.csv"
+            merged_filename = f"{year}_{month_num}_{sensor_id}.{self.merged_format}"
             merged_path = merged_base_folder / merged_filename
 
-            if merged_path.exists():
-                print(f"✓ Merged file already exists: {merged_filename}")
+            # Merged file of an earlier run, possibly in the other format
+            existing = next((
+                path for path in (merged_path.with_suffix(f'.{fmt}') for fmt in MERGED_FORMATS)
+                if path.exists()
+            ), None)
+            merge_manifest = self._load_merge_manifest(merged_base_folder)
+
+            if existing is not None:
+                # Only daily files written after the merged file are new
+                merged_mtime = existing.stat().st_mtime
+                new_files = [f for f in csv_files if f.stat().st_mtime > merged_mtime]
+                if not new_files:
+                    logger.debug("Merged file already up to date: %s", existing.name)
+                    return
+
+                # New days after the merged ones are appended to a CSV merge
+                merged_inputs = merge_manifest.get(existing.name)
+                if (self.use_fast_merge and existing.suffix == '.csv' and merged_inputs
+                        and new_files[0].name > max(merged_inputs)
+                        and self._append_csv_files(new_files, existing)):
+                    self._record_merge(merged_base_folder, merge_manifest, existing.name,
+                                       merged_inputs + [f.name for f in new_files])
+                    logger.info("Appended %d new files to %s", len(new_files), existing.name)
+                    return
+
+                logger.info("Rebuilding %s: %d files changed", existing.name, len(new_files))
+                if existing != merged_path:
+                    existing.unlink()
+
+            logger.info("Merging %d files in %s", len(csv_files), month_folder.name)
+
+            if (self.use_fast_merge and self.merged_format == 'csv'
+                    and self._concat_csv_files(csv_files, merged_path)):
+                self._record_merge(merged_base_folder, merge_manifest, merged_filename,
+                                   [f.name for f in csv_files])
+                logger.info("Monthly merged file created: %s", merged_path)
                 return
 
-            print(f"\n📦 Merging {len(csv_files)} files in {month_folder.name}...")
-
             # Read all files - using list comprehension is faster
             dataframes = []
             for csv_file in csv_files:
                 try:
-                    df = pd.read_csv(csv_file, sep=';', low_memory=False)
+                    df = _read_sensor_csv(csv_file)
                     dataframes.append(df)
                 except Exception as e:
-                    print(f"  ✗ Error reading {csv_file.name}: {e}")
+                    logger.warning("Error reading %s: %s", csv_file.name, e)
 
             if not dataframes:
-                print(f"⚠️  No valid CSV files to merge in {month_folder.name}")
+                logger.warning("No valid CSV files to merge in %s", month_folder.name)
                 return
 
             # Concatenate all at once - faster than incremental
             merged_df = pd.concat(dataframes, ignore_index=True)
 
-            # Sort and deduplicate
-            if 'timestamp' in merged_df.columns:
-                merged_df = merged_df.sort_values('timestamp').reset_index(drop=True)
-
-            initial_rows = len(merged_df)
-            merged_df = merged_df.drop_duplicates()
-            final_rows = len(merged_df)
-
-            if initial_rows != final_rows:
-                print(f"  ℹ️  Removed {initial_rows - final_rows:,} duplicate rows")
+            merged_df = _sort_and_dedupe(merged_df, self.dedupe)
 
             # Save
-            merged_df.to_csv(merged_path, sep=';', index=False)
-            print(f"\n✅ MONTHLY MERGED FILE CREATED!")
-            print(f"  📄 {merged_filename}")
-            print(f"  📊 {len(merged_df):,} total rows")
-            print(f"  📁 {merged_path}")
+            _write_merged_file(merged_df, merged_path)
+            self._record_merge(merged_base_folder, merge_manifest, merged_filename,
+                               [f.name for f in csv_files])
+            logger.info("Monthly merged file created: %s (%d rows)", merged_path, len(merged_df))
 
         except Exception as e:
-            print(f"❌ Error merging CSV files in {month_folder.name}: {e}")
+            logger.exception("Error merging CSV files in %s", month_folder.name)
+
+    @staticmethod
+    def _load_merge_manifest(merged_base_folder: Path) -> Dict[str, List[str]]:
+        """Input file names of each monthly merged file, or {} if unreadable."""
+        try:
+            with open(merged_base_folder / '.merge_manifest.json', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_merge(self, merged_base_folder: Path, merge_manifest: Dict[str, List[str]],
+                      merged_filename: str, input_names: List[str]):
+        """Store the inputs of a monthly merged file in the merge manifest."""
+        with self._merge_manifest_lock:
+            # Other months of the sensor may have been recorded meanwhile
+            merge_manifest.update(self._load_merge_manifest(merged_base_folder))
+            merge_manifest[merged_filename] = input_names
+            with tempfile.NamedTemporaryFile('w', dir=merged_base_folder, suffix='.tmp',
+                                             delete=False, encoding='utf-8') as f:
+                json.dump(merge_manifest, f)
+            os.replace(f.name, merged_base_folder / '.merge_manifest.json')
+
+    @staticmethod
+    def _scan_files(folder: Path, suffixes, exclude_prefixes=()) -> List[Path]:
+        """
+        Sorted files of a folder whose name ends with one of ``suffixes``.
+
+        Uses a single os.scandir pass; unlike Path.glob, names are matched
+        without extra per-entry system calls.
+        """
+        with os.scandir(folder) as entries:
+            # Sorted by the plain name strings, not by Path objects
+            names = sorted(
+                entry.name for entry in entries
+                if entry.name.endswith(suffixes) and not entry.name.startswith(exclude_prefixes)
+            )
+        return [folder / name for name in names]
+
+    @staticmethod
+    def _concat_csv_files(csv_files: List[Path], output_path: Path) -> bool:
+        """
+        Merge CSV files by copying their bytes, keeping only the first header.
+
+        Daily files are named by date, so concatenating them in name order is
+        already chronological. This only works when every file has the same
+        header line; placeholder files use a fixed SDS011 layout, so a month
+        mixing them with real data of another sensor type is left to pandas.
+
+        Args:
+            csv_files: Sorted list of files to merge
+            output_path: Path of the merged file
+
+        Returns:
+            True if the merged file was written, False if the headers differ
+        """
+        headers = set()
+        for csv_file in csv_files:
+            with open(csv_file, 'rb') as src:
+                headers.add(src.readline().rstrip(b'\r\n'))
+        header = headers.pop()
+        if headers or not header:
+            return False
+
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        with open(tmp_path, 'wb') as dst:
+            dst.write(header + b'\n')
+            for csv_file in csv_files:
+                with open(csv_file, 'rb') as src:
+                    src.readline()
+                    body_start = src.tell()
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+
+                    # Keep rows apart if a file lacks a trailing newline
+                    if src.tell() > body_start:
+                        src.seek(-1, os.SEEK_END)
+                        if src.read(1) != b'\n':
+                            dst.write(b'\n')
+
+        os.replace(tmp_path, output_path)
+        return True
+
+    @staticmethod
+    def _append_csv_files(csv_files: List[Path], output_path: Path) -> bool:
+        """
+        Append the bodies of CSV files to a merged CSV file.
+
+        Args:
+            csv_files: Sorted list of files to append, all newer than the merged days
+            output_path: Path of the existing merged file
+
+        Returns:
+            True if the files were appended, False if a header differs from
+            the merged file's
+        """
+        with open(output_path, 'rb') as merged:
+            header = merged.readline().rstrip(b'\r\n')
+            merged.seek(0, os.SEEK_END)
+            if merged.tell() > 0:
+                merged.seek(-1, os.SEEK_END)
+                needs_newline = merged.read(1) != b'\n'
+            else:
+                needs_newline = False
+
+        for csv_file in csv_files:
+            with open(csv_file, 'rb') as src:
+                if src.readline().rstrip(b'\r\n') != header:
+                    return False
+
+        with open(output_path, 'ab') as dst:
+            if needs_newline:
+                dst.write(b'\n')
+            for csv_file in csv_files:
+                with open(csv_file, 'rb') as src:
+                    src.readline()
+                    body_start = src.tell()
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+
+                    # Keep rows apart if a file lacks a trailing newline
+                    if src.tell() > body_start:
+                        src.seek(-1, os.SEEK_END)
+                        if src.read(1) != b'\n':
+                            dst.write(b'\n')
+        return True
 
     def merge_months_by_year(self, sensor_folder: Path, sensor_id: str,
                              sensor_type: Optional[str] = None):
@@ -555,13 +1105,14 @@ class GetSensorData:
             merged_base_folder = station_folder / 'merged' / sensor_id
             merged_base_folder.mkdir(parents=True, exist_ok=True)
 
-            monthly_merged_files = sorted([
-                f for f in merged_base_folder.glob(f'*_{sensor_id}.csv')
-                if not f.name.startswith('FULL_')
-            ])
+            monthly_merged_files = self._scan_files(
+                merged_base_folder,
+                tuple(f'_{sensor_id}.{fmt}' for fmt in MERGED_FORMATS),
+                exclude_prefixes=('FULL_',)
+            )
 
             if not monthly_merged_files:
-                print("⚠️  No monthly merged files found to merge by year")
+                logger.warning("No monthly merged files found to merge by year")
                 return
 
             # Group by year
@@ -575,60 +1126,55 @@ class GetSensorData:
                     years_dict[year].append(merged_file)
 
             if not years_dict:
-                print("⚠️  No valid monthly files found to merge by year")
+                logger.warning("No valid monthly files found to merge by year")
                 return
 
-            # Merge each year
+            # Collect the years that still need a yearly file
+            pending = []
             for year, year_files in years_dict.items():
-                print(f"\n📅 Merging year {year}...")
-                print(f"  Found {len(year_files)} months")
+                logger.debug("Year %s: %d months", year, len(year_files))
 
-                yearly_filename = f"FULL_{year}_{sensor_id}.csv"
+                yearly_filename = f"FULL_{year}_{sensor_id}.{self.merged_format}"
                 yearly_path = merged_base_folder / yearly_filename
 
-                if yearly_path.exists():
-                    print(f"  ✓ Yearly file already exists: {yearly_filename}")
-                    continue
-
-                print(f"\n📦 Merging {len(year_files)} monthly files for year {year}...")
-
-                # Read all monthly files
-                dataframes = []
-                for csv_file in sorted(year_files):
-                    try:
-                        df = pd.read_csv(csv_file, sep=';', low_memory=False)
-                        dataframes.append(df)
-                        print(f"  ✓ {csv_file.name}: {len(df):,} rows")
-                    except Exception as e:
-                        print(f"  ✗ Error reading {csv_file.name}: {e}")
-
-                if not dataframes:
-                    print(f"⚠️  No valid CSV files to merge for year {year}")
+                existing = [
+                    yearly_path.with_suffix(f'.{fmt}') for fmt in MERGED_FORMATS
+                    if yearly_path.with_suffix(f'.{fmt}').exists()
+                ]
+                if existing:
+                    # Rebuilt only when a monthly file changed since
+                    yearly_mtime = existing[0].stat().st_mtime
+                    if all(f.stat().st_mtime <= yearly_mtime for f in year_files):
+                        logger.debug("Yearly file already up to date: %s", existing[0].name)
+                        continue
+                    for path in existing:
+                        if path != yearly_path:
+                            path.unlink()
+
+                # Monthly CSVs are chronological by name and don't overlap, so
+                # without dedupe their bytes can be streamed into the yearly file
+                if (self.use_fast_merge and not self.dedupe and self.merged_format == 'csv'
+                        and all(f.suffix == '.csv' for f in year_files)
+                        and self._concat_csv_files(year_files, yearly_path)):
+                    logger.info("Yearly merged file created: %s", yearly_path)
                     continue
 
-                # Concatenate
-                merged_df = pd.concat(dataframes, ignore_index=True)
-
-                # Sort and deduplicate
-                if 'timestamp' in merged_df.columns:
-                    merged_df = merged_df.sort_values('timestamp').reset_index(drop=True)
+                pending.append((year, year_files, yearly_path, self.dedupe))
 
-                initial_rows = len(merged_df)
-                merged_df = merged_df.drop_duplicates()
-                final_rows = len(merged_df)
-
-                if initial_rows != final_rows:
-                    print(f"  ℹ️  Removed {initial_rows - final_rows:,} duplicate rows")
-
-                # Save
-                merged_df.to_csv(yearly_path, sep=';', index=False)
-                print(f"\n✅ YEARLY MERGED FILE CREATED!")
-                print(f"  📄 {yearly_filename}")
-                print(f"  📊 {len(merged_df):,} total rows")
-                print(f"  📁 {yearly_path}")
+            # Merge the other years with pandas; several years are merged in
+            # parallel processes
+            if len(pending) == 1:
+                _merge_year_files(*pending[0])
+            elif pending:
+                workers = min(len(pending), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=_merge_mp_context()) as executor:
+                    futures = [executor.submit(_merge_year_files, *job) for job in pending]
+                    for future in futures:
+                        future.result()
 
         except Exception as e:
-            print(f"❌ Error merging by year: {e}")
+            logger.exception("Error merging by year")
 
     def set_date_range(self, start_date: str, end_date: str):
         """
@@ -640,7 +1186,7 @@ class GetSensorData:
         """
         self.start_date = start_date
         self.end_date = end_date
-        print(f"📅 Date range set: {start_date} to {end_date}")
+        logger.debug("Date range set: %s to %s", start_date, end_date)
 
     def download_multiple_sensors(self, sensor_ids: List[str],
                                   sensor_type: Optional[str] = None,
@@ -648,9 +1194,15 @@ class GetSensorData:
                                   merge: bool = True,
                                   create_missing: bool = True,
                                   auto_fetch_metadata: bool = True,
-                                  merge_by_year: bool = False):
+                                  merge_by_year: bool = False,
+                                  sensor_workers: int = 4) -> Dict[str, Dict[str, List[str]]]:
         """
-        Download data for multiple sensors.
+        Download data for multiple sensors, several at a time.
+
+        Each sensor is downloaded by its own GetSensorData (the sensor metadata
+        lives on the instance) sharing this one's session and manifest. Unless
+        a semaphore was given, one is created so that all sensors together
+        keep at most max_workers dates in flight.
 
         Args:
             sensor_ids: List of sensor IDs
@@ -660,15 +1212,53 @@ class GetSensorData:
             create_missing: If True, create placeholder files when data is not found
             auto_fetch_metadata: If True, automatically fetch location data from API
             merge_by_year: If True, merge all months in the same year into a single file
+            sensor_workers: Number of sensors downloaded at the same time (default: 4)
+
+        Returns:
+            Dictionary with sensor ID as key and download_from_date() result as value
         """
-        for i, sensor_id in enumerate(sensor_ids, 1):
-            print(f"\nSENSOR {i}/{len(sensor_ids)}: {sensor_id}")
-            self.download_from_date(sensor_id, sensor_type, list_only, merge,
-                                    create_missing, auto_fetch_metadata, merge_by_year)
+        semaphore = self._semaphore
+        if isinstance(semaphore, nullcontext):
+            semaphore = threading.BoundedSemaphore(self.max_workers)
+
+        def download_one(sensor_id):
+            downloader = GetSensorData(
+                output_dir=self.output_dir,
+                max_workers=self.max_workers,
+                semaphore=semaphore,
+                session=self.session,
+                use_fast_merge=self.use_fast_merge,
+                manifest=self.manifest,
+                merged_format=self.merged_format,
+                dedupe=self.dedupe
+            )
+            downloader.start_date = self.start_date
+            downloader.end_date = self.end_date
+            result = downloader.download_from_date(
+                sensor_id, sensor_type, list_only, merge,
+                create_missing, auto_fetch_metadata, merge_by_year
+            )
+            return result, downloader.completed_months
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(sensor_workers, len(sensor_ids)))) as executor:
+            future_to_sensor = {
+                executor.submit(download_one, sensor_id): sensor_id
+                for sensor_id in sensor_ids
+            }
+            for i, future in enumerate(as_completed(future_to_sensor), 1):
+                sensor_id = future_to_sensor[future]
+                results[sensor_id], completed_months = future.result()
+                self.completed_months.update(completed_months)
+                logger.info("Sensor %d/%d done: %s", i, len(sensor_ids), sensor_id)
+
+        return results
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Example with optimized parallel downloads
     downloader = GetSensorData(output_dir='sensor_data', max_workers=20)
 
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-15 09:30
+
+from django.db import migrations, models
+
+
+def merge_duplicate_value_types(apps, schema_editor):
+    """Point references to duplicate ValueType names at the oldest row and drop the rest."""
+    ValueType = apps.get_model('sensor', 'ValueType')
+    SensorDataValue = apps.get_model('sensor', 'SensorDataValue')
+    SensorTypeValueTypeMapping = apps.get_model('sensor', 'SensorTypeValueTypeMapping')
+
+    keep_by_name = {}
+    for value_type in ValueType.objects.order_by('id'):
+        keep = keep_by_name.setdefault(value_type.name, value_type)
+        if keep.pk == value_type.pk:
+            continue
+
+        SensorDataValue.objects.filter(measurement=value_type).update(measurement=keep)
+
+        # (sensor_type, value_type) is unique; drop mappings the kept row already has
+        kept_sensor_types = SensorTypeValueTypeMapping.objects.filter(
+            value_type=keep
+        ).values('sensor_type')
+        SensorTypeValueTypeMapping.objects.filter(
+            value_type=value_type, sensor_type__in=kept_sensor_types
+        ).delete()
+        SensorTypeValueTypeMapping.objects.filter(value_type=value_type).update(value_type=keep)
+
+        value_type.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_value_types, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='valuetype',
+            name='name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-15 10:00
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_sensor_data_values(apps, schema_editor):
+    """Keep the oldest row for every (sensor, timestamp, measurement)."""
+    SensorDataValue = apps.get_model('sensor', 'SensorDataValue')
+
+    duplicates = (
+        SensorDataValue.objects
+        .values('sensor', 'timestamp', 'measurement')
+        .annotate(keep_id=Min('id'), count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates.iterator():
+        SensorDataValue.objects.filter(
+            sensor=row['sensor'],
+            timestamp=row['timestamp'],
+            measurement=row['measurement'],
+        ).exclude(id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0002_valuetype_name_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_sensor_data_values, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='sensordatavalue',
+            index=models.Index(fields=['sensor', '-timestamp'], name='sdv_sensor_ts_desc'),
+        ),
+        migrations.AddConstraint(
+            model_name='sensordatavalue',
+            constraint=models.UniqueConstraint(fields=('sensor', 'timestamp', 'measurement'), name='sdv_unique_sensor_timestamp_measurement'),
+        ),
+        migrations.AddIndex(
+            model_name='valuetype',
+            index=models.Index(fields=['value_type'], name='valuetype_value_type_idx'),
+        ),
+    ]
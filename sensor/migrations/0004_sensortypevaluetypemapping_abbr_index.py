@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-15 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0003_sensordatavalue_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sensortypevaluetypemapping',
+            name='abbr',
+            field=models.CharField(blank=True, db_index=True, max_length=5, null=True),
+        ),
+    ]
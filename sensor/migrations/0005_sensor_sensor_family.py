@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-15 13:00
+
+from django.db import migrations, models
+
+
+def set_sensor_families(apps, schema_editor):
+    # Same mapping as Sensor.family_for (historical models have no custom methods)
+    families = ('SDS011', 'BMP180', 'DHT22')
+    Sensor = apps.get_model('sensor', 'Sensor')
+
+    sensors = list(Sensor.objects.select_related('sensor_type'))
+    for sensor in sensors:
+        sensor_name = (sensor.sensor_type.name or '').upper()
+        sensor.sensor_family = next((family for family in families if family in sensor_name), '')
+    Sensor.objects.bulk_update(sensors, ['sensor_family'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0004_sensortypevaluetypemapping_abbr_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sensor',
+            name='sensor_family',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=16),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_sensor_families, migrations.RunPython.noop),
+    ]
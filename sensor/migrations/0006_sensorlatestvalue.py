@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-15 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_latest_values(apps, schema_editor):
+    SensorDataValue = apps.get_model('sensor', 'SensorDataValue')
+    SensorLatestValue = apps.get_model('sensor', 'SensorLatestValue')
+
+    # PostgreSQL DISTINCT ON: the newest row per sensor and measurement
+    latest = SensorDataValue.objects.order_by(
+        'sensor_id', 'measurement_id', '-timestamp'
+    ).distinct('sensor_id', 'measurement_id').only(
+        'sensor_id', 'measurement_id', 'value', 'timestamp'
+    )
+    SensorLatestValue.objects.bulk_create(
+        (
+            SensorLatestValue(sensor_id=value.sensor_id, measurement_id=value.measurement_id,
+                              value=value.value, timestamp=value.timestamp)
+            for value in latest.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0005_sensor_sensor_family'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SensorLatestValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.TextField()),
+                ('timestamp', models.DateTimeField()),
+                ('measurement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sensor.valuetype')),
+                ('sensor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='latest_values', to='sensor.sensor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('sensor', 'measurement'), name='slv_unique_sensor_measurement')],
+            },
+        ),
+        migrations.RunPython(fill_latest_values, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-15 14:00
+
+from django.db import migrations
+
+# Daily chunks, matching the today-range queries
+CHUNK_TIME_INTERVAL = '1 day'
+
+
+def create_hypertable(apps, schema_editor):
+    """
+    Partition sensor_sensordatavalue by timestamp when the TimescaleDB
+    extension is installed; plain PostgreSQL databases are left unchanged.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+        if cursor.fetchone() is None:
+            return
+
+        # Unique constraints of a hypertable must include the partitioning
+        # column; id stays unique through its sequence
+        cursor.execute(
+            "ALTER TABLE sensor_sensordatavalue DROP CONSTRAINT IF EXISTS sensor_sensordatavalue_pkey"
+        )
+        cursor.execute("ALTER TABLE sensor_sensordatavalue ADD PRIMARY KEY (id, timestamp)")
+        cursor.execute(
+            "SELECT create_hypertable('sensor_sensordatavalue', 'timestamp', "
+            "chunk_time_interval => %s::interval, migrate_data => true, if_not_exists => true)",
+            [CHUNK_TIME_INTERVAL],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0006_sensorlatestvalue'),
+    ]
+
+    operations = [
+        # A hypertable can't be turned back into a plain table in place
+        migrations.RunPython(create_hypertable, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-15 14:30
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_sensors(apps, schema_editor):
+    Station = apps.get_model('sensor', 'Station')
+    Sensor = apps.get_model('sensor', 'Sensor')
+
+    Station.objects.update(sensor_count=Coalesce(Subquery(
+        Sensor.objects.filter(station=OuterRef('pk')).order_by()
+        .values('station').annotate(count=Count('pk')).values('count')[:1],
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sensor', '0007_sensordatavalue_hypertable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='station',
+            name='sensor_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_sensors, migrations.RunPython.noop),
+    ]
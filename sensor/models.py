@@ -1,15 +1,24 @@
 import uuid
-from datetime import datetime, time, timezone
+from datetime import datetime, time, timedelta
+from functools import lru_cache
 from django.contrib.gis.db import models
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 
 from core.models import TimeStampedModel, UserStampedModel
-from .utils import reverse_geocode
 
 User = get_user_model()
 
+# Seconds before a station's geocoding can be queued again
+GEOCODE_QUEUE_TIMEOUT = 60 * 5
+
 # Create your models here.
 class Station(TimeStampedModel, UserStampedModel):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -26,31 +35,54 @@ class Station(TimeStampedModel, UserStampedModel):
     last_notify = models.DateTimeField(null=True, blank=True)
     kickoff_date = models.DateTimeField(auto_now_add=True)
     location_display_name = models.TextField(blank=True)
+    # Number of sensors, kept up to date by the Sensor signals below
+    sensor_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def update_sensor_counts(cls, station_ids):
+        """Recount the sensors of the given stations (e.g. after a bulk_create)."""
+        cls.objects.filter(pk__in=station_ids).update(sensor_count=Coalesce(Subquery(
+            Sensor.objects.filter(station=OuterRef('pk')).order_by()
+            .values('station').annotate(count=Count('pk')).values('count')[:1],
+        ), 0))
+
     def save(self, *args, **kwargs):
         if not self.sensor_uid:
             self.sensor_uid = str(self.uid)
-        if self.location and not self.location_display_name:
-            geocoded = reverse_geocode(self.location)
-            self.location_display_name = geocoded.get('display_name', '')
         super().save(*args, **kwargs)
 
+        if self.location and not self.location_display_name:
+            transaction.on_commit(self.queue_geocoding)
+
+    def queue_geocoding(self):
+        """
+        Look up location_display_name in the background, since the geocoder
+        is slow and rate-limited. Queued at most once per GEOCODE_QUEUE_TIMEOUT.
+        """
+        from core import tasks
+        from .tasks import geocode_station_task
+
+        if cache.add(f'geocode_station:{self.pk}', True, GEOCODE_QUEUE_TIMEOUT):
+            tasks.defer(geocode_station_task, self.pk)
+
     @property
     def location_name(self):
-        if not self.location_display_name:
-            geocoded = reverse_geocode(self.location)
-            self.location_display_name = geocoded.get('display_name', '')
-            self.save()
+        # Never geocodes or writes during the read; a missing name is queued.
+        # A deferred location isn't loaded for this, the task checks it
+        if (not self.location_display_name and self.pk
+                and ('location' in self.get_deferred_fields() or self.location)):
+            self.queue_geocoding()
 
         return self.location_display_name
 
     @property
     def get_sensor_data(self):
-        sensor_data = Sensor.objects.filter(station=self)
-        return sensor_data
+        # Uses the sensors prefetched with prefetch_related('sensors'), if any;
+        # prefer sensor_count where only the count is needed
+        return self.sensors.all()
 
 
 class SensorType(TimeStampedModel, UserStampedModel):
@@ -70,12 +102,48 @@ class SensorType(TimeStampedModel, UserStampedModel):
 
 
 class ValueType(TimeStampedModel, UserStampedModel):
-    name = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, unique=True)
     value_type = models.CharField(max_length=255)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['value_type'], name='valuetype_value_type_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+    @classmethod
+    def create_from_codes(cls, codes):
+        """
+        Make sure a ValueType exists for every sensor.community value type code,
+        named after the code. Existing rows are found with one query and only
+        the missing ones are inserted, so nothing is written when all exist.
+        """
+        codes = set(codes)
+        existing = cls.objects.in_bulk(codes, field_name='name')
+        missing = codes - existing.keys()
+        if missing:
+            cls.objects.bulk_create(
+                [cls(name=code, value_type=code) for code in missing],
+                ignore_conflicts=True,
+            )
+
+
+# Measurements shown per sensor family; other sensors show their newest value
+SENSOR_FAMILY_MEASUREMENTS = {
+    'SDS011': frozenset(('P1', 'P2')),
+    'BMP180': frozenset(('pressure', 'temperature', 'pressure_at_sealevel')),
+    'DHT22': frozenset(('temperature', 'humidity')),
+}
+
+
+@lru_cache(maxsize=2)
+def _day_bounds(day, tz):
+    """Aware start of ``day`` and of the next day in ``tz``, shared by all sensors."""
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    return start, start + timedelta(days=1)
+
 
 class Sensor(TimeStampedModel, UserStampedModel):
     sensor_id = models.BigIntegerField(
@@ -92,6 +160,8 @@ class Sensor(TimeStampedModel, UserStampedModel):
     )
     description = models.TextField(null=True, blank=True)
     kickoff_date = models.DateTimeField(auto_now_add=True)
+    # Key of SENSOR_FAMILY_MEASUREMENTS derived from the sensor type name
+    sensor_family = models.CharField(max_length=16, db_index=True, blank=True)
 
 
     class Meta:
@@ -105,49 +175,76 @@ class Sensor(TimeStampedModel, UserStampedModel):
     def __str__(self) -> str:
         return f'{self.station.name}-{self.sensor_type.name}'
 
-    @property
-    def get_sensor_data_value(self):
-        # ---- 1. TODAY (local, matches admin) ----
-        today = datetime.now().date()
-        start_dt = datetime.combine(today, time.min)
-        end_dt = datetime.combine(today, time.max)
-
-        # ---- 2. Which measurements we want ----
-        sensor_name = self.sensor_type.name.upper()
-
-        if "SDS011" in sensor_name:
-            wanted = ["P1", "P2"]
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Station as loaded, so saving a moved sensor recounts both stations
+        # without querying the old value (see the signals below)
+        instance._loaded_station_id = instance.__dict__.get('station_id')
+        return instance
 
-        elif "BMP180" in sensor_name:
-            wanted = ["pressure", "temperature", "pressure_at_sealevel"]
-
-        elif "DHT22" in sensor_name:
-            wanted = ["temperature", "humidity"]
-
-        else:
-            wanted = None  # fallback
+    def save(self, *args, **kwargs):
+        self.set_sensor_family()
+        super().save(*args, **kwargs)
 
-        # ---- 3. Base queryset (today only) ----
-        qs = (
-            self.sensordatavalues
-            .filter(timestamp__range=(start_dt, end_dt))
-            .select_related("measurement")
-            .order_by("-timestamp")
+    def set_sensor_family(self):
+        """Derive sensor_family from the sensor type (save() bypassers must call this)."""
+        if self.sensor_type_id:
+            self.sensor_family = self.family_for(self.sensor_type.name)
+
+    @staticmethod
+    def family_for(sensor_type_name):
+        sensor_name = (sensor_type_name or '').upper()
+        return next((family for family in SENSOR_FAMILY_MEASUREMENTS if family in sensor_name), '')
+
+    @staticmethod
+    def _today_filter():
+        """
+        Lookups for today (local, matches admin) as a half-open range.
+        """
+        start, end = _day_bounds(timezone.localdate(), timezone.get_current_timezone())
+        return {'timestamp__gte': start, 'timestamp__lt': end}
+
+    @classmethod
+    def today_values_prefetch(cls):
+        """
+        Prefetch of the latest value per measurement, if it is from today, as
+        ``today_values``, used by get_sensor_data_value instead of one query
+        per sensor, e.g. ``prefetch_related(Sensor.today_values_prefetch())``.
+        """
+        return Prefetch(
+            'latest_values',
+            queryset=SensorLatestValue.objects.filter(
+                **cls._today_filter()
+            ).select_related('measurement'),
+            to_attr='today_values',
         )
 
-        # ---- 4. Fallback: return first value ----
+    @property
+    def get_sensor_data_value(self):
+        # ---- 1. Which measurements we want (None: fallback) ----
+        wanted = SENSOR_FAMILY_MEASUREMENTS.get(self.sensor_family)
+
+        # ---- 2. Latest value of today PER measurement (prefetched or queried) ----
+        values = getattr(self, 'today_values', None)
+        if values is None:
+            # At most one row per measurement in SensorLatestValue
+            values = (
+                self.latest_values
+                .filter(**self._today_filter())
+                .select_related("measurement")
+            )
+
+        # ---- 3. Fallback: return the newest value ----
         if not wanted:
-            first = qs.first()
+            first = max(values, key=lambda value: value.timestamp, default=None)
             return {first.measurement.name: first} if first else {}
 
-        # ---- 5. Latest value PER measurement ----
-        result = {}
-        for value in qs:
-            name = value.measurement.name
-            if name in wanted and name not in result:
-                result[name] = value
-
-        return result
+        return {
+            value.measurement.name: value
+            for value in values
+            if value.measurement.name in wanted
+        }
 
 
 class SensorDataValue(TimeStampedModel, UserStampedModel):
@@ -159,9 +256,78 @@ class SensorDataValue(TimeStampedModel, UserStampedModel):
     value = models.TextField(null=False)
     measurement = models.ForeignKey(ValueType, on_delete=models.PROTECT)
 
+    class Meta:
+        indexes = [
+            # Newest-first per sensor, as the latest-value queries read it
+            models.Index(fields=['sensor', '-timestamp'], name='sdv_sensor_ts_desc'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sensor', 'timestamp', 'measurement'],
+                name='sdv_unique_sensor_timestamp_measurement',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.measurement.name}-{self.value}'
+
+
+class SensorLatestValue(models.Model):
+    """
+    Newest SensorDataValue per sensor and measurement, kept up to date on
+    ingest (see record()), so the latest readings are point lookups instead
+    of scans of the value history.
+    """
+    sensor = models.ForeignKey(
+        Sensor, related_name='latest_values',
+        on_delete=models.CASCADE
+    )
+    measurement = models.ForeignKey(ValueType, on_delete=models.CASCADE)
+    value = models.TextField(null=False)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sensor', 'measurement'],
+                name='slv_unique_sensor_measurement',
+            ),
+        ]
+
     def __str__(self) -> str:
         return f'{self.measurement.name}-{self.value}'
 
+    @classmethod
+    def record(cls, sensor, values):
+        """
+        Upsert the newest of the given SensorDataValue objects of one sensor
+        per measurement, unless a newer value is stored already.
+        """
+        newest = {}
+        for value in values:
+            current = newest.get(value.measurement_id)
+            if current is None or value.timestamp > current.timestamp:
+                newest[value.measurement_id] = value
+
+        if not newest:
+            return
+
+        stored = dict(
+            cls.objects.filter(sensor=sensor, measurement_id__in=newest)
+            .values_list('measurement_id', 'timestamp')
+        )
+        cls.objects.bulk_create(
+            [
+                cls(sensor=sensor, measurement_id=measurement_id,
+                    value=value.value, timestamp=value.timestamp)
+                for measurement_id, value in newest.items()
+                if measurement_id not in stored or value.timestamp > stored[measurement_id]
+            ],
+            update_conflicts=True,
+            unique_fields=['sensor', 'measurement'],
+            update_fields=['value', 'timestamp'],
+        )
+
 
 class SensorTypeValueTypeMapping(TimeStampedModel, UserStampedModel):
     sensor_type = models.ForeignKey(
@@ -172,7 +338,7 @@ class SensorTypeValueTypeMapping(TimeStampedModel, UserStampedModel):
     )
     abbr = models.CharField(
         max_length=5, unique=False,
-        blank=True, null=True
+        blank=True, null=True, db_index=True
     )
 
     class Meta:
@@ -200,13 +366,32 @@ class SensorTypeValueTypeMapping(TimeStampedModel, UserStampedModel):
             if self.pk:
                 qs = qs.exclude(pk=self.pk)
 
-            if not qs.filter(abbr=cand1).exists():
+            # One query for both candidates
+            taken = set(qs.filter(abbr__in=[cand1, cand2]).values_list('abbr', flat=True))
+
+            if cand1 not in taken:
                 self.abbr = cand1
-            elif not qs.filter(abbr=cand2).exists():
+            elif cand2 not in taken:
                 self.abbr = cand2
             else:
                 raise ValidationError(
                     f"Abbr collision for '{cand1}' and '{cand2}'. Please enter abbr manually."
                 )
 
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=Sensor, dispatch_uid='sensor_count_save')
+def _update_station_sensor_count_on_save(sender, instance, created=False, **kwargs):
+    # Only a new sensor, or one moved to another station, changes the counts
+    loaded_station_id = getattr(instance, '_loaded_station_id', None)
+    if created or loaded_station_id != instance.station_id:
+        Station.update_sensor_counts(
+            {instance.station_id, loaded_station_id} - {None}
+        )
+        instance._loaded_station_id = instance.station_id
+
+
+@receiver(post_delete, sender=Sensor, dispatch_uid='sensor_count_delete')
+def _update_station_sensor_count_on_delete(sender, instance, **kwargs):
+    Station.update_sensor_counts({instance.station_id})
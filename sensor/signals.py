@@ -0,0 +1,18 @@
+import uuid
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import CoreSensorType
+
+# Cache key of the current version of the sensor type choices (see forms.py)
+CORE_SENSOR_TYPE_CHOICES_VERSION_KEY = 'core_sensor_type_choices:version'
+
+
+# Connected in SensorConfig.ready(), so also edits made before sensor.forms
+# is imported (loaddata, management commands) invalidate the choices
+@receiver(post_save, sender=CoreSensorType, dispatch_uid='core_sensor_type_choices_save')
+@receiver(post_delete, sender=CoreSensorType, dispatch_uid='core_sensor_type_choices_delete')
+def _bump_core_sensor_type_choices_version(**kwargs):
+    cache.set(CORE_SENSOR_TYPE_CHOICES_VERSION_KEY, uuid.uuid4().hex, None)
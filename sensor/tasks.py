@@ -0,0 +1,56 @@
+"""
+Background tasks of the sensor app (run through core.tasks.submit or defer).
+"""
+from .fetch_sensor_data_values import (fetch_and_store_sensor_data, fetch_sensor_data_value,
+                                       get_value_types_by_code)
+from .get_sensor_data import GetSensorData
+from .models import Sensor, Station
+from .utils import reverse_geocode
+
+
+def fetch_and_store_sensor_data_task(task_id):
+    """Fetch the latest data of all sensors (queued by the refresh view)."""
+    fetch_and_store_sensor_data()
+
+
+def fetch_sensor_data_task(task_id, sensor_pk):
+    """
+    Fetch the latest data of a newly added sensor.
+
+    Takes the primary key rather than the Sensor object, so the sensor is
+    loaded fresh in the worker thread.
+    """
+    sensor = Sensor.objects.select_related('station', 'sensor_type').get(pk=sensor_pk)
+
+    # Session with the retry policy used for all sensor.community requests
+    with GetSensorData.create_session() as session:
+        fetch_sensor_data_value(sensor, session=session)
+
+
+def fetch_sensors_data_task(task_id, sensor_pks):
+    """
+    Fetch the latest data of several newly added sensors (see
+    SensorForm.bulk_save), loading them in one query and sharing the HTTP
+    session and the ValueType lookup between them.
+    """
+    sensors = Sensor.objects.select_related('station', 'sensor_type').filter(pk__in=sensor_pks)
+    value_types = get_value_types_by_code()
+
+    with GetSensorData.create_session() as session:
+        for sensor in sensors:
+            fetch_sensor_data_value(sensor, session=session, value_types=value_types)
+
+
+def geocode_station_task(task_id, station_pk):
+    """
+    Store the geocoded display name of a station (queued by Station.save).
+    """
+    station = Station.objects.only('location', 'location_display_name').get(pk=station_pk)
+    if not station.location or station.location_display_name:
+        return
+
+    geocoded = reverse_geocode(station.location)
+    if geocoded:
+        station.location_display_name = geocoded.get('display_name', '')
+        # updated_at too, it versions the cached station list on the home page
+        station.save(update_fields=['location_display_name', 'updated_at'])
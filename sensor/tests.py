@@ -1,3 +1,363 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from core.models import CoreSensorType
+
+from .fetch_sensor_data_values import fetch_and_store_sensor_data
+from .forms import SensorForm
+from .get_sensor_data import GetSensorData
+from .models import (
+    Sensor, SensorDataValue, SensorLatestValue, SensorType, Station, ValueType,
+)
+from .tasks import fetch_sensors_data_task
+
+
+def _readings(*timestamps, values=(('P1', '1.5'), ('P2', '0.5'))):
+    """sensor.community API data points, one per timestamp."""
+    return [
+        {
+            'timestamp': timestamp,
+            'sensordatavalues': [
+                {'value_type': value_type, 'value': value}
+                for value_type, value in values
+            ],
+        }
+        for timestamp in timestamps
+    ]
+
+
+def _fake_session(data_points):
+    """Stands in for GetSensorData.create_session(), answering every GET with data_points."""
+    session = mock.MagicMock()
+    session.__enter__.return_value = session
+    session.get.return_value.json.return_value = data_points
+    return session
+
+
+class FetchSensorDataTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # No location, so saving the stations queues no geocoding
+        cls.station_a = Station.objects.create(name='Station A')
+        cls.station_b = Station.objects.create(name='Station B')
+        cls.sensor_type = SensorType.objects.create(name='SDS011', manufacturer='Nova Fitness')
+        cls.p1 = ValueType.objects.create(name='P1', value_type='P1')
+        cls.p2 = ValueType.objects.create(name='P2', value_type='P2')
+        cls.sensor_a = Sensor.objects.create(sensor_id=101, station=cls.station_a, sensor_type=cls.sensor_type)
+        cls.sensor_b = Sensor.objects.create(sensor_id=102, station=cls.station_b, sensor_type=cls.sensor_type)
+
+    def fetch(self, data_points):
+        with mock.patch.object(GetSensorData, 'create_session', return_value=_fake_session(data_points)):
+            fetch_and_store_sensor_data()
+
+    def test_query_count_does_not_grow_with_readings(self):
+        data_points = _readings(
+            '2024-01-01 10:00:00', '2024-01-01 10:05:00', '2024-01-01 10:10:00',
+        )
+        # The sensors and the value types, then per sensor: existing
+        # timestamps, SAVEPOINT, INSERT of the values, SELECT and upsert of
+        # the latest values, RELEASE SAVEPOINT
+        with self.assertNumQueries(2 + 2 * 6):
+            self.fetch(data_points)
+
+        self.assertEqual(SensorDataValue.objects.count(), 2 * 3 * 2)
+
+    def test_refetching_stores_readings_once(self):
+        self.fetch(_readings('2024-01-01 10:00:00'))
+        self.fetch(_readings('2024-01-01 10:00:00', '2024-01-01 10:05:00'))
+
+        self.assertEqual(SensorDataValue.objects.filter(sensor=self.sensor_a).count(), 2 * 2)
+
+    def test_duplicate_values_are_ignored(self):
+        # What a concurrent fetch of the same readings would insert
+        timestamp = datetime(2024, 1, 1, 10, tzinfo=dt_timezone.utc)
+        SensorDataValue.objects.bulk_create(
+            [
+                SensorDataValue(sensor=self.sensor_a, measurement=self.p1, value='1.5', timestamp=timestamp),
+                SensorDataValue(sensor=self.sensor_a, measurement=self.p1, value='1.5', timestamp=timestamp),
+            ],
+            ignore_conflicts=True,
+        )
+
+        self.assertEqual(SensorDataValue.objects.count(), 1)
+
+    def test_latest_values_are_recorded(self):
+        self.fetch(_readings('2024-01-01 10:00:00'))
+        self.fetch(_readings('2024-01-01 10:05:00', values=(('P1', '3.0'),)))
+
+        latest = {
+            value.measurement_id: value.value
+            for value in SensorLatestValue.objects.filter(sensor=self.sensor_a)
+        }
+        self.assertEqual(latest, {self.p1.pk: '3.0', self.p2.pk: '0.5'})
+
+
+class SensorLatestValueTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        station = Station.objects.create(name='Station A')
+        sensor_type = SensorType.objects.create(name='SDS011', manufacturer='Nova Fitness')
+        cls.sensor = Sensor.objects.create(sensor_id=101, station=station, sensor_type=sensor_type)
+        cls.p1 = ValueType.objects.create(name='P1', value_type='P1')
+        cls.p2 = ValueType.objects.create(name='P2', value_type='P2')
+
+    def value(self, measurement, value, hour):
+        return SensorDataValue(
+            sensor=self.sensor, measurement=measurement, value=value,
+            timestamp=datetime(2024, 1, 1, hour, tzinfo=dt_timezone.utc),
+        )
+
+    def latest(self):
+        return {
+            value.measurement_id: (value.value, value.timestamp.hour)
+            for value in SensorLatestValue.objects.filter(sensor=self.sensor)
+        }
+
+    def test_keeps_newest_value_per_measurement(self):
+        SensorLatestValue.record(self.sensor, [
+            self.value(self.p1, '2.0', 11),
+            self.value(self.p1, '1.0', 10),
+            self.value(self.p2, '5.0', 10),
+        ])
+
+        self.assertEqual(self.latest(), {self.p1.pk: ('2.0', 11), self.p2.pk: ('5.0', 10)})
+
+    def test_newer_value_replaces_stored_value(self):
+        SensorLatestValue.record(self.sensor, [self.value(self.p1, '1.0', 10)])
+        SensorLatestValue.record(self.sensor, [self.value(self.p1, '2.0', 11)])
+
+        self.assertEqual(self.latest(), {self.p1.pk: ('2.0', 11)})
+
+    def test_older_value_does_not_replace_stored_value(self):
+        SensorLatestValue.record(self.sensor, [self.value(self.p1, '2.0', 11)])
+        SensorLatestValue.record(self.sensor, [self.value(self.p1, '1.0', 10)])
+
+        self.assertEqual(self.latest(), {self.p1.pk: ('2.0', 11)})
+
+    def test_no_values_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            SensorLatestValue.record(self.sensor, [])
+
+
+SENSOR_DETAILS = {
+    'station_latitude': 52.52,
+    'station_longitude': 13.405,
+    'station_altitude': 34.0,
+    'sensor_type_manufacturer': 'Nova Fitness',
+    'sensor_type_name': 'SDS011',
+    'sensor_value_types': ['P1', 'P2'],
+}
+
+
+class SensorFormTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.station_a = Station.objects.create(name='Station A')
+        cls.station_b = Station.objects.create(name='Station B', altitude=120.0)
+
+    def setUp(self):
+        # Sensor details and sensor type choices are cached between requests
+        cache.clear()
+        patcher = mock.patch('sensor.forms.get_sensor_details', return_value=SENSOR_DETAILS)
+        self.get_sensor_details = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clean_creates_sensor_type_and_value_types(self):
+        form = SensorForm.for_station_pk(self.station_a.pk, data={'sensor_id': 101})
+
+        self.assertTrue(form.is_valid(), form.errors)
+        sensor_type = form.cleaned_data['sensor_type']
+        self.assertEqual((sensor_type.manufacturer, sensor_type.name), ('Nova Fitness', 'SDS011'))
+        self.assertEqual(
+            set(ValueType.objects.values_list('value_type', flat=True)), {'P1', 'P2'},
+        )
+
+    def test_clean_sets_missing_station_altitude(self):
+        form = SensorForm.for_station_pk(self.station_a.pk, data={'sensor_id': 101})
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.station_a.refresh_from_db()
+        self.assertEqual(self.station_a.altitude, 34.0)
+        self.assertEqual(form.station.altitude, 34.0)
+
+    def test_clean_keeps_station_altitude(self):
+        form = SensorForm.for_station_pk(self.station_b.pk, data={'sensor_id': 101})
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.station_b.refresh_from_db()
+        self.assertEqual(self.station_b.altitude, 120.0)
+
+    def test_clean_requires_sensor_type_without_details(self):
+        self.get_sensor_details.return_value = {}
+        form = SensorForm.for_station_pk(self.station_a.pk, data={'sensor_id': 101})
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('please select a sensor type', str(form.non_field_errors()))
+
+    def test_clean_reuses_sensor_type_by_name_without_details(self):
+        self.get_sensor_details.return_value = {}
+        existing = SensorType.objects.create(name='SDS011', manufacturer='Nova Fitness')
+        core_sensor_type = CoreSensorType.objects.create(name='SDS011', description='')
+        form = SensorForm.for_station_pk(
+            self.station_a.pk, data={'sensor_id': 101, 'sensor_type': core_sensor_type.pk},
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['sensor_type'], existing)
+        self.assertEqual(SensorType.objects.count(), 1)
+
+    def test_clean_requires_sensor_id(self):
+        form = SensorForm.for_station_pk(self.station_a.pk, data={})
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('sensor_id', form.errors)
+        self.get_sensor_details.assert_not_called()
+
+    def test_sensor_details_are_cached(self):
+        for _ in range(2):
+            form = SensorForm.for_station_pk(self.station_a.pk, data={'sensor_id': 101})
+            self.assertTrue(form.is_valid(), form.errors)
+
+        self.get_sensor_details.assert_called_once_with(101)
+
+    @mock.patch('sensor.forms.tasks.defer')
+    def test_bulk_save(self, defer):
+        forms = [
+            SensorForm.for_station_pk(self.station_a.pk, data={'sensor_id': 101}),
+            SensorForm.for_station_pk(self.station_b.pk, data={'sensor_id': 102}),
+        ]
+        for form in forms:
+            self.assertTrue(form.is_valid(), form.errors)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sensors = SensorForm.bulk_save(forms)
+            # Queued only once the sensors are committed
+            defer.assert_not_called()
+
+        self.assertEqual(
+            sorted(Sensor.objects.values_list('sensor_id', 'station_id', 'sensor_family')),
+            [(101, self.station_a.pk, 'SDS011'), (102, self.station_b.pk, 'SDS011')],
+        )
+        self.assertEqual(
+            sorted(Station.objects.values_list('sensor_count', flat=True)), [1, 1],
+        )
+        defer.assert_called_once_with(fetch_sensors_data_task, [sensor.pk for sensor in sensors])
+
+    @mock.patch('sensor.forms.tasks.defer')
+    def test_bulk_save_without_forms(self, defer):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(SensorForm.bulk_save([]), [])
+        defer.assert_not_called()
+
+
+class MigrationTestCase(TransactionTestCase):
+    """
+    Migrates the sensor app back to ``migrate_from``, lets setUpBeforeMigration()
+    create rows with the historical models, then migrates to ``migrate_to``
+    and leaves its historical models in ``self.apps``.
+    """
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self):
+        super().setUp()
+        executor = MigrationExecutor(connection)
+        executor.migrate([('sensor', self.migrate_from)])
+        old_apps = executor.loader.project_state([('sensor', self.migrate_from)]).apps
+        self.setUpBeforeMigration(old_apps)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([('sensor', self.migrate_to)])
+        self.apps = executor.loader.project_state([('sensor', self.migrate_to)]).apps
+
+    def tearDown(self):
+        # Back to the latest migrations for the tests that follow
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def setUpBeforeMigration(self, apps):
+        pass
+
+    @staticmethod
+    def create_sensor(apps, sensor_id, station_name, sensor_type_name):
+        Station = apps.get_model('sensor', 'Station')
+        SensorType = apps.get_model('sensor', 'SensorType')
+        Sensor = apps.get_model('sensor', 'Sensor')
+
+        # Historical models have no save() filling in sensor_uid
+        station, _ = Station.objects.get_or_create(name=station_name, sensor_uid=station_name)
+        sensor_type, _ = SensorType.objects.get_or_create(name=sensor_type_name)
+        return Sensor.objects.create(sensor_id=sensor_id, station=station, sensor_type=sensor_type)
+
+
+class SensorFamilyMigrationTests(MigrationTestCase):
+    migrate_from = '0004_sensortypevaluetypemapping_abbr_index'
+    migrate_to = '0005_sensor_sensor_family'
+
+    def setUpBeforeMigration(self, apps):
+        self.create_sensor(apps, 101, 'Station A', 'SDS011')
+        self.create_sensor(apps, 102, 'Station B', 'dht22')
+        self.create_sensor(apps, 103, 'Station C', 'BME280')
+
+    def test_sensor_families_are_set(self):
+        Sensor = self.apps.get_model('sensor', 'Sensor')
+
+        self.assertEqual(
+            dict(Sensor.objects.values_list('sensor_id', 'sensor_family')),
+            {101: 'SDS011', 102: 'DHT22', 103: ''},
+        )
+
+
+class SensorLatestValueMigrationTests(MigrationTestCase):
+    migrate_from = '0005_sensor_sensor_family'
+    migrate_to = '0006_sensorlatestvalue'
+
+    def setUpBeforeMigration(self, apps):
+        ValueType = apps.get_model('sensor', 'ValueType')
+        SensorDataValue = apps.get_model('sensor', 'SensorDataValue')
+
+        sensor = self.create_sensor(apps, 101, 'Station A', 'SDS011')
+        p1 = ValueType.objects.create(name='P1', value_type='P1')
+        p2 = ValueType.objects.create(name='P2', value_type='P2')
+        SensorDataValue.objects.bulk_create([
+            SensorDataValue(sensor=sensor, measurement=measurement, value=value,
+                            timestamp=datetime(2024, 1, 1, hour, tzinfo=dt_timezone.utc))
+            for measurement, value, hour in ((p1, '1.0', 10), (p1, '2.0', 11), (p2, '5.0', 10))
+        ])
+
+    def test_latest_values_are_filled(self):
+        SensorLatestValue = self.apps.get_model('sensor', 'SensorLatestValue')
+
+        self.assertEqual(
+            sorted(SensorLatestValue.objects.values_list('measurement__name', 'value')),
+            [('P1', '2.0'), ('P2', '5.0')],
+        )
+
+
+class StationSensorCountMigrationTests(MigrationTestCase):
+    migrate_from = '0007_sensordatavalue_hypertable'
+    migrate_to = '0008_station_sensor_count'
+
+    def setUpBeforeMigration(self, apps):
+        Station = apps.get_model('sensor', 'Station')
+
+        self.create_sensor(apps, 101, 'Station A', 'SDS011')
+        self.create_sensor(apps, 102, 'Station A', 'DHT22')
+        Station.objects.create(name='Station B', sensor_uid='Station B')
+
+    def test_sensor_counts_are_set(self):
+        Station = self.apps.get_model('sensor', 'Station')
+
+        self.assertEqual(
+            dict(Station.objects.values_list('name', 'sensor_count')),
+            {'Station A': 2, 'Station B': 0},
+        )
@@ -8,4 +8,5 @@ urlpatterns = [
     path('station/add/', views.add_station, name='add_station'),
     path('sensor/add/', views.add_sensor, name='add_sensor'),
     path("refresh/", views.refresh_sensor_data, name="refresh"),
+    path("refresh/status/<str:task_id>/", views.refresh_status, name="refresh_status"),
 ]
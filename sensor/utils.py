@@ -1,12 +1,28 @@
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
 
 import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session for the sensor.community API, so lookups don't
+# pay a new TCP+TLS handshake each
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+   pool_connections=20,
+   pool_maxsize=20,
+   max_retries=Retry(total=2, backoff_factor=0.3),
+))
+
+# Parallel lookups in get_sensor_details_many()
+SENSOR_DETAILS_WORKERS = 10
 
 
 def get_sensor_details(sensor_id) -> Dict:
    url = f'https://data.sensor.community/airrohr/v1/sensor/{sensor_id}/'
    try:
-      response = requests.get(url)
+      response = _SESSION.get(url, timeout=5)
       if response.status_code == 200:
          data = response.json()
          first_data = data[0]
@@ -36,12 +52,27 @@ def get_sensor_details(sensor_id) -> Dict:
       return {}
 
 
+def get_sensor_details_many(sensor_ids: Iterable) -> Dict:
+   """
+   get_sensor_details() for several sensors at once, over the shared session.
+
+   Returns:
+      Dictionary of sensor id to details ({} for failed lookups)
+   """
+   sensor_ids = list(sensor_ids)
+   with ThreadPoolExecutor(max_workers=SENSOR_DETAILS_WORKERS) as executor:
+      return dict(zip(sensor_ids, executor.map(get_sensor_details, sensor_ids)))
+
+
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 
 _geolocator = Nominatim(user_agent="sensolog_app")
 _reverse = RateLimiter(_geolocator.reverse, min_delay_seconds=1)
 
+# Geocoded addresses barely change; 4 decimal places is roughly 11 m
+REVERSE_GEOCODE_CACHE_TTL = 60 * 60 * 24 * 30
+
 def reverse_geocode(point):
     """
     point: GEOS Point (lon, lat)
@@ -49,6 +80,11 @@ def reverse_geocode(point):
     if not point:
         return None
 
+    key = f"revgeo:{round(point.y, 4)}:{round(point.x, 4)}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     location = _reverse(
         (point.y, point.x),  # lat, lon
         exactly_one=True,
@@ -60,7 +96,7 @@ def reverse_geocode(point):
 
     address = location.raw.get("address", {})
 
-    return {
+    geocoded = {
         "display_name": location.address,
         "country": address.get("country"),
         "state": address.get("state"),
@@ -68,6 +104,8 @@ def reverse_geocode(point):
                 or address.get("town")
                 or address.get("village"),
     }
+    cache.set(key, geocoded, REVERSE_GEOCODE_CACHE_TTL)
+    return geocoded
 
 
 
@@ -5,22 +5,61 @@ from django.contrib import messages
 from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
-from django.shortcuts import render, redirect, get_object_or_404
+from django.db.models import Count, FloatField, Func, Max, Prefetch, Q, Subquery, Sum
+from django.shortcuts import render, redirect
+from django.utils import timezone
 
-from .fetch_sensor_data_values import fetch_and_store_sensor_data
+from core import tasks
 from .forms import StationForm, SensorForm
-from .models import Station
+from .models import Sensor, SensorLatestValue, SensorType, Station
+from .tasks import fetch_and_store_sensor_data_task
+
+
+def _newest(queryset, field):
+    """Newest value of ``field`` in ``queryset`` as a scalar subquery."""
+    return Subquery(queryset.order_by(f'-{field}').values(field)[:1])
 
 
 # Create your views here.
 @login_required
 def home(request):
-    stations = Station.objects.all()
+    # The station list is only evaluated when its cached template fragments
+    # are stale; the sensors the templates list and their values of today are
+    # loaded in two more queries instead of per station.
+    # Only the station fields the templates read are loaded; PostGIS returns
+    # the coordinates, so no GEOS geometry is built per station
+    stations = Station.objects.only(
+        'id', 'uid', 'name', 'is_active', 'location_display_name'
+    ).annotate(
+        lon=Func('location', function='ST_X', output_field=FloatField()),
+        lat=Func('location', function='ST_Y', output_field=FloatField()),
+    ).prefetch_related(
+        Prefetch('sensors', queryset=Sensor.objects.select_related('sensor_type').prefetch_related(
+            Sensor.today_values_prefetch()
+        ))
+    )
     # core_sensor_types = CoreSensorType.objects.all()
 
-    # Stats
-    total_locations = len(stations)
-    active_sensors = sum(len(s.get_sensor_data) for s in stations if getattr(s, 'is_active', True))
+    # Stats and the version of the data the station fragments show, in one
+    # query over the station rows: sensor counts come from the sensor_count
+    # column, the other tables are only read by uncorrelated subqueries
+    stats = Station.objects.aggregate(
+        total_stations=Count('id'),
+        active_sensors=Sum('sensor_count', filter=Q(is_active=True), default=0),
+        total_sensors=Sum('sensor_count', default=0),
+        stations_updated=Max('updated_at'),
+        sensors_updated=Max(_newest(Sensor.objects, 'updated_at')),
+        sensor_types_updated=Max(_newest(SensorType.objects, 'updated_at')),
+        values_updated=Max(_newest(SensorLatestValue.objects, 'timestamp')),
+    )
+    total_locations = stats['total_stations']
+    active_sensors = stats['active_sensors']
+    # Today's values are shown, so the fragments also change with the date
+    stations_version = '|'.join(str(value) for value in (
+        timezone.localdate(), stats['total_sensors'], stats['stations_updated'],
+        stats['sensors_updated'], stats['sensor_types_updated'], stats['values_updated'],
+        total_locations,
+    ))
 
     # Initialize empty forms - MAKE SURE THESE ARE PASSED
     station_form = StationForm()
@@ -31,6 +70,7 @@ def home(request):
         'stations': stations,
         'total_stations': total_locations,
         'active_sensors': active_sensors,
+        'stations_version': stations_version,
         'station_form': station_form,
         'sensor_form': sensor_form,
         'station_path': os.path.exists(station_path)
@@ -53,10 +93,8 @@ def add_station(request):
 
 @require_POST
 def add_sensor(request):
-    station_id = request.POST.get('station')
-    station = get_object_or_404(Station, id=station_id)
-
-    form = SensorForm(request.POST, station=station)
+    form = SensorForm.for_station_pk(request.POST.get('station'), request.POST)
+    station = form.station
     if form.is_valid():
         sensor = form.save()
         messages.success(request, f'Sensor added to "{station.name}" successfully!')
@@ -68,12 +106,37 @@ def add_sensor(request):
 
 @login_required
 def refresh_sensor_data(request):
+    """
+    Start fetching the latest data of all sensors in the background.
+    The task stores the values of each sensor with one bulk INSERT
+    (see fetch_sensor_data_value), not one save() per value.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "Invalid method"}, status=405)
 
-    fetch_and_store_sensor_data()
+    # The fetch runs in the background; the frontend polls refresh_status
+    task_id = tasks.submit(fetch_and_store_sensor_data_task, owner=request.user.id)
 
     return JsonResponse({
-        "status": "ok",
-        "message": "Sensor data refreshed successfully"
-    })
+        "status": "queued",
+        "task_id": task_id,
+        "message": "Sensor data refresh started"
+    }, status=202)
+
+
+@login_required
+def refresh_status(request, task_id):
+    """Return the state of a refresh started by refresh_sensor_data."""
+    status = tasks.get_status(task_id)
+
+    if status is None or status.get('owner') != request.user.id:
+        return JsonResponse({"error": "Task not found"}, status=404)
+
+    return JsonResponse(_status_response(status))
+
+
+def _status_response(status):
+    response = {"state": status['state']}
+    if status['state'] == 'FAILURE':
+        response["error"] = status['error']
+    return response